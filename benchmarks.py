@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmarks
+Timing and memory measurements on large synthetic skill trees.
+Run `python3 benchmarks.py --help` for the available benchmarks.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from compression import open_tree_file
+from outline import write_outline
+import skill_import
+from skill_export import _walk, export_markdown, export_opml
+from propagation import POLICIES
+from skill_model import SkillModel
+
+
+def synthetic_model(count, fanout=10, seed=0):
+    """Build a balanced tree of count nodes with about half the leaves completed."""
+    rng = random.Random(seed)
+    model = SkillModel()
+    for node in range(count):
+        parent = (node - 1) // fanout if node else -1
+        model.add_node(parent, f"Skill {node}", is_open=True)
+
+    for node in range(count):
+        if model.is_leaf(node) and rng.random() < 0.5:
+            model.completed[node] = 1
+    model.refresh_parents()
+    return model
+
+
+def _write_tab_outline(model, f):
+    """Write model as an outline with one tab per level."""
+    for node, entering in _walk(model):
+        if entering:
+            f.write("\t" * model.depth[node] + model.text[node] + "\n")
+
+
+def bench_importers(args):
+    """Time each importer on the same tree and measure the readers' peak memory."""
+    model = synthetic_model(args.lines)
+    writers = {
+        "indented": (".txt", lambda f: write_outline(model, f)),
+        "tabs": (".txt", lambda f: _write_tab_outline(model, f)),
+        "markdown": (".md", lambda f: export_markdown(model, f)),
+        "opml": (".opml", lambda f: export_opml(model, f))
+    }
+
+    print(f"{'format':<10} {'lines':>9} {'MB':>7} {'build s':>8} {'traced read s':>14} {'reader peak KB':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        for import_format, (extension, write) in writers.items():
+            file_path = os.path.join(directory, import_format + extension)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                write(f)
+            size = os.path.getsize(file_path) / 1e6
+
+            # Full import into a model
+            start = time.perf_counter()
+            imported = skill_import.import_file(file_path, SkillModel(), import_format)
+            build_time = time.perf_counter() - start
+            assert len(imported) == len(model)
+            del imported
+
+            # Streaming the records alone must stay in bounded memory
+            reader = skill_import.READERS[import_format]
+            mode = 'rb' if import_format == "opml" else 'r'
+            tracemalloc.start()
+            start = time.perf_counter()
+            with open(file_path, mode) as f:
+                for _ in reader(f):
+                    pass
+            read_time = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"{import_format:<10} {len(model):>9} {size:>7.1f} {build_time:>8.2f} {read_time:>14.2f} {peak / 1024:>15.0f}")
+
+
+def bench_compression(args):
+    """Compare file size, save and load time of each codec and level."""
+    tree_data = synthetic_model(args.nodes).to_json()
+    candidates = [(".json", None), (".json.gz", 1), (".json.gz", 6), (".json.gz", 9),
+                  (".json.bz2", 1), (".json.bz2", 9), (".json.xz", 0), (".json.xz", 6)]
+
+    print(f"{'file':<10} {'level':>5} {'MB':>8} {'ratio':>6} {'save s':>7} {'load s':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        plain_size = None
+        for extension, level in candidates:
+            file_path = os.path.join(directory, "tree" + extension)
+
+            start = time.perf_counter()
+            with open_tree_file(file_path, 'w', level) as f:
+                json.dump(tree_data, f, indent=4)
+            save_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with open_tree_file(file_path, 'r') as f:
+                json.load(f)
+            load_time = time.perf_counter() - start
+
+            size = os.path.getsize(file_path)
+            plain_size = plain_size or size
+            print(f"{extension:<10} {level if level is not None else '-':>5} {size / 1e6:>8.2f} "
+                  f"{plain_size / size:>6.1f} {save_time:>7.2f} {load_time:>7.2f}")
+
+
+def bench_propagation(args):
+    """Time each policy's single toggles and bulk marking."""
+    rng = random.Random(args.seed)
+
+    # Throughput on a large balanced tree
+    model = synthetic_model(args.nodes)
+    leaves = [node for node in range(len(model)) if model.is_leaf(node)]
+    print(f"{'policy':<10} {'toggles/s':>10} {'bulk nodes/s':>13}")
+    for policy in POLICIES:
+        engine = model.propagation(policy)
+        sample = [rng.choice(leaves) for _ in range(args.toggles)]
+
+        start = time.perf_counter()
+        for node in sample:
+            engine.toggle(node)
+        toggle_rate = len(sample) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        engine.set_many(leaves, True)
+        bulk_rate = len(leaves) / (time.perf_counter() - start)
+        print(f"{policy:<10} {toggle_rate:>10.0f} {bulk_rate:>13.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill tree benchmarks.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    importers = subparsers.add_parser("importers", help="importer speed and memory")
+    importers.add_argument("--lines", type=int, default=1_000_000)
+    importers.set_defaults(run=bench_importers)
+
+    compression = subparsers.add_parser("compression", help="size and speed of compressed saves")
+    compression.add_argument("--nodes", type=int, default=100_000)
+    compression.set_defaults(run=bench_compression)
+
+    propagation = subparsers.add_parser("propagation", help="policy throughput")
+    propagation.add_argument("--nodes", type=int, default=100_000)
+    propagation.add_argument("--toggles", type=int, default=10_000)
+    propagation.add_argument("--seed", type=int, default=0)
+    propagation.set_defaults(run=bench_propagation)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compressed Tree Files
+Opens saved trees as .json, .json.gz, .json.bz2 or .json.xz, streaming
+through the matching standard-library codec. Writing picks the codec
+from the file extension; reading also recognises it by magic bytes.
+"""
+import bz2
+import gzip
+import lzma
+import os
+
+
+# Codec by file extension
+CODECS = {
+    ".gz": gzip,
+    ".bz2": bz2,
+    ".xz": lzma
+}
+
+# Leading bytes of each compressed format
+MAGIC_BYTES = (
+    (b"\x1f\x8b", gzip),
+    (b"BZh", bz2),
+    (b"\xfd7zXZ\x00", lzma)
+)
+
+# Extensions accepted as saved trees, for file dialogs
+TREE_EXTENSIONS = (".json", ".json.gz", ".json.bz2", ".json.xz")
+
+
+def is_tree_file(file_path):
+    """Check whether file_path names a saved JSON tree, compressed or not."""
+    return file_path.lower().endswith(TREE_EXTENSIONS)
+
+
+def _sniff_codec(file_path):
+    """Return the codec whose magic bytes start the file, or None for plain text."""
+    with open(file_path, 'rb') as f:
+        head = f.read(6)
+    for magic, codec in MAGIC_BYTES:
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def open_tree_file(file_path, mode='r', level=None):
+    """Open a tree file for text reading ('r') or writing ('w').
+
+    level is the compression level (1-9 for gzip and bz2, 0-9 for xz);
+    None keeps the codec's default.
+    """
+    if mode == 'r':
+        codec = _sniff_codec(file_path)
+    else:
+        codec = CODECS.get(os.path.splitext(file_path)[1].lower())
+
+    if codec is None:
+        return open(file_path, mode, encoding='utf-8')
+
+    if mode == 'r' or level is None:
+        return codec.open(file_path, mode + 't', encoding='utf-8')
+    if codec is lzma:
+        return lzma.open(file_path, 'wt', preset=level, encoding='utf-8')
+    return codec.open(file_path, 'wt', compresslevel=level, encoding='utf-8')
@@ -0,0 +1,170 @@
+"""
+Shared Documents
+Opens several progress files with the same skills without keeping a copy
+of the tree per file. The hierarchy and skill names live once in a
+read-only StructureCore, looked up by a hash of the structure, and each
+document's SkillModel only adds its own completion and open flags.
+
+A progress file (.progress.json) saves just those flags, packed one bit
+per skill, with the structure hash and the path of a tree file that has
+the structure. Opening one whose structure is already loaded reads only
+the bits.
+"""
+from array import array
+import base64
+import hashlib
+import json
+import os
+import sys
+import weakref
+
+from compression import is_tree_file, open_tree_file
+from skill_model import SkillModel
+
+
+# Extension of files holding one learner's flags for a shared tree
+PROGRESS_EXTENSION = ".progress.json"
+
+# Byte 0/1 <-> character "0"/"1", for packing flags through int()
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def structure_hash(parents, texts):
+    """Return a hash of a tree given each node's parent and name in preorder."""
+    encoded = json.dumps([list(parents), list(texts)], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def pack_flags(flags):
+    """Pack a bytearray of 0/1 flags into base64 text, eight flags per byte."""
+    digits = bytes(flags).translate(_TO_DIGITS)[::-1]
+    packed = int(digits or b"0", 2).to_bytes((len(flags) + 7) // 8, "little")
+    return base64.b64encode(packed).decode('ascii')
+
+
+def unpack_flags(text, count):
+    """Return the bytearray of count flags packed by pack_flags."""
+    value = int.from_bytes(base64.b64decode(text), "little")
+    digits = format(value, "b").encode('ascii').zfill(count)[::-1][:count]
+    return bytearray(digits.translate(_FROM_DIGITS))
+
+
+def is_progress_file(file_path):
+    return file_path.lower().endswith(PROGRESS_EXTENSION)
+
+
+class StructureCore:
+    """A tree's hierarchy and skill names, shared read-only between documents."""
+
+    def __init__(self, parents, texts, digest=None):
+        count = len(texts)
+        # Repeated names ("Practice", "Review", ...) are stored once
+        self.text = tuple(sys.intern(text) for text in texts)
+        self.parent = array('i', parents)
+        self.hash = digest or structure_hash(parents, texts)
+
+        # Parents come before their children, so one pass fills in the rest
+        children = [[] for _ in range(count)]
+        roots = []
+        depth = array('i', bytes(4 * count))
+        for node, parent in enumerate(self.parent):
+            if parent >= 0:
+                children[parent].append(node)
+                depth[node] = depth[parent] + 1
+            else:
+                roots.append(node)
+        self.children = tuple(map(tuple, children))
+        self.roots = tuple(roots)
+        self.depth = depth
+
+    def __len__(self):
+        return len(self.text)
+
+
+def _flatten(tree_data):
+    """Return the parents, names, completed and open flags of a saved tree, in preorder."""
+    parents, texts = [], []
+    completed, is_open = bytearray(), bytearray()
+
+    # Same order as SkillModel.from_json, so node numbers agree
+    stack = [(-1, child) for child in reversed(tree_data.get("children", []))]
+    while stack:
+        parent, node_data = stack.pop()
+        node = len(texts)
+        parents.append(parent)
+        texts.append(node_data["text"])
+        completed.append(1 if node_data.get("completed", False) else 0)
+        is_open.append(1 if node_data.get("open", True) else 0)
+        for child_data in reversed(node_data.get("children", [])):
+            stack.append((node, child_data))
+
+    return parents, texts, completed, is_open
+
+
+class DocumentCache:
+    def __init__(self):
+        # Structure hash -> core, kept only while some document uses it
+        self.cores = weakref.WeakValueDictionary()
+
+        # Structure hash -> a tree file it was loaded from, for progress files
+        self.sources = {}
+
+    def core(self, parents, texts):
+        """Return the shared core for a structure, creating it the first time."""
+        digest = structure_hash(parents, texts)
+        core = self.cores.get(digest)
+        if core is None:
+            core = StructureCore(parents, texts, digest)
+            self.cores[digest] = core
+        return core
+
+    def open(self, file_path):
+        """Load a progress file, saved tree, outline or import as a model on a shared core."""
+        if is_progress_file(file_path):
+            return self._open_progress(file_path)
+
+        if is_tree_file(file_path):
+            with open_tree_file(file_path, 'r') as f:
+                parents, texts, completed, is_open = _flatten(json.load(f))
+        else:
+            model = SkillModel.from_file(file_path)
+            parents, texts, completed, is_open = model.parent, model.text, model.completed, model.open
+
+        core = self.core(parents, texts)
+        self.sources.setdefault(core.hash, os.path.abspath(file_path))
+        return SkillModel.from_core(core, completed, is_open)
+
+    def _open_progress(self, file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            progress = json.load(f)
+
+        # Only load the tree file if no open document has its structure
+        core = self.cores.get(progress["structure"])
+        if core is None:
+            tree_path = os.path.join(os.path.dirname(os.path.abspath(file_path)), progress["tree"])
+            core = self.open(tree_path).core
+            if core.hash != progress["structure"]:
+                raise ValueError(f"{progress['tree']} no longer has the skills {file_path} was saved for")
+
+        count = len(core)
+        return SkillModel.from_core(
+            core,
+            unpack_flags(progress["completed"], count),
+            unpack_flags(progress["open"], count)
+        )
+
+    def save_progress(self, model, file_path):
+        """Write a model's flags as a progress file pointing at its structure's tree file."""
+        if model.core is None or model.core.hash not in self.sources:
+            raise ValueError("Only documents opened on a shared structure can be saved as progress")
+
+        tree_path = self.sources[model.core.hash]
+        progress = {
+            "structure": model.core.hash,
+            "tree": os.path.relpath(tree_path, os.path.dirname(os.path.abspath(file_path))),
+            "completed": pack_flags(model.completed),
+            "open": pack_flags(model.open)
+        }
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(progress, f, indent=4)
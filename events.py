@@ -0,0 +1,119 @@
+"""
+Change Events
+A small event bus for tree changes. Listeners get batches rather than
+one call per node: changes made inside bus.batch() arrive together, and
+a listener with a coalescing window hears about them at most once per
+window, with the ids of everything that changed in the meantime.
+"""
+from contextlib import contextmanager
+
+
+# Event kinds
+NODE_CHANGED = "changed"
+NODE_INSERTED = "inserted"
+NODE_REMOVED = "removed"
+BULK_LOADED = "loaded"
+
+
+class ChangeBatch:
+    """The changes a listener hasn't been told about yet."""
+
+    __slots__ = ("changed", "inserted", "removed", "loaded")
+
+    def __init__(self):
+        self.changed = set()
+        self.inserted = set()
+        self.removed = set()
+        self.loaded = False  # The whole tree was replaced; listeners should rescan
+
+    def __bool__(self):
+        return self.loaded or bool(self.changed or self.inserted or self.removed)
+
+    def add(self, kind, nodes):
+        if kind == BULK_LOADED:
+            # A reload supersedes everything before it
+            self.loaded = True
+            self.changed.clear()
+            self.inserted.clear()
+            self.removed.clear()
+        elif kind == NODE_CHANGED:
+            self.changed.update(nodes)
+        elif kind == NODE_INSERTED:
+            self.inserted.update(nodes)
+        elif kind == NODE_REMOVED:
+            self.removed.update(nodes)
+
+
+class Subscription:
+    def __init__(self, callback, window, schedule):
+        self.callback = callback
+        self.window = window      # Milliseconds to coalesce over, or None to deliver at once
+        self.schedule = schedule  # e.g. a Tk widget's after(ms, func)
+        self.pending = ChangeBatch()
+        self.scheduled = False
+
+    def deliver(self):
+        """Hand the pending batch to the listener and start a new one."""
+        self.scheduled = False
+        batch, self.pending = self.pending, ChangeBatch()
+        if batch:
+            self.callback(batch)
+
+
+class EventBus:
+    def __init__(self):
+        self.subscriptions = []
+        self._batch_depth = 0
+
+    def subscribe(self, callback, window=None, schedule=None):
+        """Call callback(batch) with coalesced changes.
+
+        With window=None the batch is delivered as soon as the current
+        bus.batch() block (or single emit) ends. With a window in
+        milliseconds, schedule(window, func) is used to deliver at most
+        once per window.
+        """
+        if window is not None and schedule is None:
+            raise ValueError("A coalescing window needs a schedule function")
+        subscription = Subscription(callback, window, schedule)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def emit(self, kind, node=None):
+        """Report one change (no node for BULK_LOADED)."""
+        self.emit_many(kind, () if node is None else (node,))
+
+    def emit_many(self, kind, nodes):
+        """Report the same kind of change for many nodes."""
+        if not self.subscriptions:
+            return
+        nodes = tuple(nodes)
+        for subscription in self.subscriptions:
+            subscription.pending.add(kind, nodes)
+        if not self._batch_depth:
+            self._dispatch()
+
+    @contextmanager
+    def batch(self):
+        """Hold deliveries until the block ends, so a cascade arrives as one batch."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._dispatch()
+
+    def _dispatch(self):
+        for subscription in list(self.subscriptions):
+            if not subscription.pending:
+                continue
+            if subscription.window is None:
+                subscription.deliver()
+            elif not subscription.scheduled:
+                subscription.scheduled = True
+                subscription.schedule(subscription.window, subscription.deliver)
@@ -0,0 +1,71 @@
+"""
+Subtree Eviction
+Bookkeeping for dropping the Treeview items under collapsed skills that
+haven't been touched for a while. The evicted skills' state is kept
+here, a few fields per skill, and the app re-inserts them with their
+original item IDs when the parent is opened again.
+"""
+from collections import OrderedDict
+
+
+class SubtreeEvictor:
+    def __init__(self, max_live_items=200000, idle_seconds=120):
+        # Evict the oldest collapsed subtrees while more items than this are live
+        self.max_live_items = max_live_items
+        # Evict any subtree that has stayed collapsed this long
+        self.idle_seconds = idle_seconds
+
+        # Collapsed items and when they were collapsed, least recent first
+        self.collapsed = OrderedDict()
+
+        # Items whose descendants are evicted (they hold one placeholder child)
+        self.subtrees = set()
+
+        # Evicted item -> [evicted ancestor it is stored under, text, completed, open]
+        self.nodes = {}
+
+    def __contains__(self, item_id):
+        return item_id in self.nodes
+
+    def item_collapsed(self, item_id, now):
+        self.collapsed[item_id] = now
+        self.collapsed.move_to_end(item_id)
+
+    def item_opened(self, item_id):
+        self.collapsed.pop(item_id, None)
+
+    def pop_due(self, now, live_count):
+        """Take the least recently collapsed item if it is due for eviction, else None.
+
+        An item is due once it has been collapsed for idle_seconds, or
+        regardless of age while live_count is over max_live_items.
+        """
+        if not self.collapsed:
+            return None
+        item_id, collapsed_at = next(iter(self.collapsed.items()))
+        if live_count <= self.max_live_items and now - collapsed_at < self.idle_seconds:
+            return None
+        del self.collapsed[item_id]
+        return item_id
+
+    def store(self, root_id, item_id, text, completed, is_open):
+        """Keep the state of an item evicted under root_id."""
+        self.nodes[item_id] = [root_id, text, completed, is_open]
+        self.subtrees.discard(item_id)  # Its own placeholder goes with it
+        self.collapsed.pop(item_id, None)
+
+    def adopt(self, root_id, item_id):
+        """Move an already evicted item under root_id, whose subtree now holds it."""
+        self.nodes[item_id][0] = root_id
+        self.subtrees.discard(item_id)
+        self.collapsed.pop(item_id, None)
+
+    def owner(self, item_id):
+        """Return the live item whose evicted subtree holds item_id, or None."""
+        record = self.nodes.get(item_id)
+        return record[0] if record else None
+
+    def clear(self):
+        self.collapsed.clear()
+        self.subtrees.clear()
+        self.nodes.clear()
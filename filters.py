@@ -0,0 +1,250 @@
+"""
+View Filters
+Hides skills from a ttk.Treeview without deleting them. Hidden items are
+detached with set_children, so their open state and values survive, and
+visibility comes from per-subtree counts that are kept up to date as
+skills change instead of being recomputed by a full scan.
+"""
+
+
+# Available filters
+#   All skills         - nothing hidden
+#   Hide completed     - completed skills (and everything under them) are hidden
+#   Incomplete leaves  - only incomplete bottom-level skills and their ancestors
+#   Search             - only skills whose name contains the query, and their ancestors
+FILTERS = ("All skills", "Hide completed", "Incomplete leaves", "Search")
+
+
+class TreeFilter:
+    def __init__(self, tree, is_completed):
+        self.tree = tree
+        self.is_completed = is_completed
+        self.mode = "All skills"
+        self.query = ""
+
+        # Full structure, built on first use; detached items lose their Tk parent
+        self.children = None
+        self.parent = {}
+        self.text = {}  # Skill names, cached on the first search
+
+        # Per-subtree counts: incomplete leaves, and matches for the current query
+        self.incomplete_leaves = {}
+        self.matches = {}
+
+        # Items whose children are currently only partly attached, and the
+        # detached items, whose own subtrees may be out of date
+        self.trimmed = set()
+        self.detached = set()
+
+        # Items opened to reveal search matches, closed again afterwards
+        self.opened = []
+
+    @property
+    def active(self):
+        return self.mode != "All skills"
+
+    def children_of(self, item_id):
+        """Return all children of an item, including hidden ones."""
+        if self.children is None:
+            return self.tree.get_children(item_id)
+        return self.children[item_id]
+
+    def parent_of(self, item_id):
+        """Return an item's parent ("" at the top level), even if it is hidden."""
+        # Items inserted since the last change batch aren't recorded yet,
+        # but they can't have been hidden either
+        if self.children is None or item_id not in self.parent:
+            return self.tree.parent(item_id)
+        return self.parent[item_id]
+
+    def _build(self):
+        """Record the structure and count incomplete leaves under every item."""
+        children = self.children = {}
+        parent = self.parent = {}
+        order = [""]
+        for item_id in order:
+            kids = children[item_id] = self.tree.get_children(item_id)
+            for child in kids:
+                parent[child] = item_id
+            order.extend(kids)
+
+        # Parents come before their children in order, so go backwards
+        counts = self.incomplete_leaves = {}
+        for item_id in reversed(order):
+            kids = children[item_id]
+            if kids:
+                counts[item_id] = sum(counts[child] for child in kids)
+            else:
+                counts[item_id] = 0 if item_id == "" or self.is_completed(item_id) else 1
+
+    def build(self):
+        """Record the structure now, if it hasn't been already."""
+        if self.children is None:
+            self._build()
+
+    def _count_matches(self):
+        """Count the items matching the query in every subtree."""
+        query = self.query.lower()
+        order = [""]
+        for item_id in order:
+            order.extend(self.children[item_id])
+
+        matches = self.matches = {}
+        for item_id in reversed(order):
+            count = sum(matches[child] for child in self.children[item_id])
+            if item_id:
+                text = self.text.get(item_id)
+                if text is None:
+                    text = self.text[item_id] = self.tree.item(item_id, "text")
+                if query in text.lower():
+                    count += 1
+            matches[item_id] = count
+
+    def visible(self, item_id):
+        """Check whether the current filter shows an item."""
+        if self.mode == "Hide completed":
+            return not self.is_completed(item_id)
+        if self.mode == "Incomplete leaves":
+            return self.incomplete_leaves[item_id] > 0
+        if self.mode == "Search":
+            return self.matches[item_id] > 0
+        return True
+
+    def is_shown(self, item_id):
+        """Check whether an item and all its ancestors pass the filter."""
+        if not self.active:
+            return True
+        while item_id:
+            if not self.visible(item_id):
+                return False
+            item_id = self.parent[item_id]
+        return True
+
+    def _show_children(self, item_id):
+        """Attach exactly the visible children of an item and return them."""
+        kids = self.children[item_id]
+        shown = [child for child in kids if self.visible(child)] if self.active else kids
+        if len(shown) < len(kids):
+            self.tree.set_children(item_id, *shown)
+            self.trimmed.add(item_id)
+            self.detached.update(child for child in kids if not self.visible(child))
+        elif item_id in self.trimmed:
+            self.tree.set_children(item_id, *kids)
+            self.trimmed.discard(item_id)
+        return shown
+
+    def _filter_subtree(self, item_id):
+        """Re-filter everything visible under an item."""
+        stack = [item_id]
+        while stack:
+            item_id = stack.pop()
+            shown = self._show_children(item_id)
+            if self.mode == "Search" and shown and item_id and not self.tree.item(item_id, "open"):
+                self.tree.item(item_id, open=True)
+                self.opened.append(item_id)
+            self.detached.difference_update(shown)
+            stack.extend(shown)
+
+    def _close_opened(self):
+        for item_id in self.opened:
+            self.tree.item(item_id, open=False)
+        self.opened = []
+
+    def apply(self, mode, query=""):
+        """Switch to another filter, touching only the visible part of the tree."""
+        self.build()
+        self._close_opened()
+        self.mode = mode
+        self.query = query
+        if mode == "Search":
+            self._count_matches()
+
+        # Walk down through visible items; hidden subtrees keep whatever they had
+        self._filter_subtree("")
+
+    def clear(self):
+        """Show every item again, with the open state it had before filtering."""
+        self._close_opened()
+        self.mode = "All skills"
+        for item_id in self.trimmed:
+            self.tree.set_children(item_id, *self.children[item_id])
+        self.trimmed.clear()
+        self.detached.clear()
+
+    def reset(self):
+        """Reattach everything and forget the structure, before the tree is replaced."""
+        if self.children is not None:
+            self.clear()
+        self.children = None
+        self.parent = {}
+        self.text = {}
+        self.incomplete_leaves = {}
+        self.matches = {}
+
+    def _insert(self, item_id):
+        """Add a newly inserted bottom-level item to the structure and counts."""
+        parent_id = self.tree.parent(item_id)
+        was_leaf = parent_id != "" and not self.children[parent_id]
+        self.children[parent_id] += (item_id,)
+        self.children[item_id] = ()
+        self.parent[item_id] = parent_id
+        self.matches[item_id] = 0
+
+        delta = 0 if self.is_completed(item_id) else 1
+        self.incomplete_leaves[item_id] = delta
+        if was_leaf:
+            # The parent no longer counts as a leaf itself
+            delta -= self.incomplete_leaves[parent_id]
+        self._add_to_ancestors(parent_id, delta)
+
+    def _add_to_ancestors(self, item_id, delta):
+        while True:
+            self.incomplete_leaves[item_id] += delta
+            if item_id == "":
+                break
+            item_id = self.parent[item_id]
+
+    def on_tree_changed(self, batch):
+        """Keep the counts current and re-filter the parents of changed items."""
+        if batch.loaded:
+            self.reset()
+            return
+        if self.children is None:
+            return
+
+        # Insert parents before their children when both are new in this batch
+        pending = set(batch.inserted)
+        for item_id in batch.inserted:
+            chain = []
+            while item_id in pending:
+                pending.discard(item_id)
+                chain.append(item_id)
+                item_id = self.tree.parent(item_id)
+            for item_id in reversed(chain):
+                self._insert(item_id)
+        if batch.inserted and self.mode == "Search":
+            self._count_matches()
+
+        # A leaf may have flipped any number of times; compare with its stored count
+        for item_id in batch.changed:
+            if not self.children[item_id]:
+                delta = (0 if self.is_completed(item_id) else 1) - self.incomplete_leaves[item_id]
+                if delta:
+                    self._add_to_ancestors(item_id, delta)
+
+        if not self.active:
+            return
+        affected = set()
+        for item_id in batch.changed | batch.inserted:
+            parent_id = self.parent[item_id]
+            while parent_id not in affected:
+                affected.add(parent_id)
+                if parent_id == "":
+                    break
+                parent_id = self.parent[parent_id]
+        for item_id in affected:
+            for child in self._show_children(item_id):
+                # A skill that was hidden may have an out-of-date subtree
+                if child in self.detached:
+                    self.detached.discard(child)
+                    self._filter_subtree(child)
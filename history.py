@@ -0,0 +1,166 @@
+"""
+Completion History
+An append-only, column-oriented log of completion events, keyed by
+skills' stable IDs so renaming or moving a skill keeps its history.
+Timestamps only grow, so time ranges are found by binary search, and a
+per-skill list of event positions answers subtree queries by looking up
+just the subtree's skills.
+"""
+from array import array
+from bisect import bisect_left
+import json
+import struct
+import sys
+import time
+
+# File header: magic, number of skills, number of events, length of the skill table
+HISTORY_MAGIC = b"SKHIST2\n"
+# Files from before stable IDs, whose skill table holds paths
+PATH_HISTORY_MAGIC = b"SKHIST1\n"
+HEADER = struct.Struct("<8sIQI")
+
+
+class CompletionHistory:
+    def __init__(self):
+        # Event columns, in time order
+        self.times = array('d')
+        self.skills = array('i')
+        self.states = array('b')
+
+        # String table of skills' stable IDs, and the reverse lookup
+        self.keys = []
+        self.key_ids = {}
+
+        # Set when loaded from a file keyed by path, until rekey is called
+        self.keyed_by_path = False
+
+        # Skill number -> positions of its events in the columns
+        self.positions = []
+
+    def __len__(self):
+        return len(self.times)
+
+    def _skill_id(self, key):
+        skill = self.key_ids.get(key)
+        if skill is None:
+            skill = self.key_ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.positions.append(array('i'))
+        return skill
+
+    def rekey(self, new_keys):
+        """Replace keys using the new_keys mapping, leaving ones it lacks as they are."""
+        self.keys = [new_keys.get(key, key) for key in self.keys]
+        self.key_ids = {key: skill for skill, key in enumerate(self.keys)}
+        self.keyed_by_path = False
+
+    def record(self, key, completed, timestamp=None):
+        """Append a completion (or un-completion) event for the skill with stable ID key."""
+        if timestamp is None:
+            timestamp = time.time()
+        # Keep the log sorted even if the clock steps backwards
+        if self.times and timestamp < self.times[-1]:
+            timestamp = self.times[-1]
+
+        skill = self._skill_id(key)
+        self.positions[skill].append(len(self.times))
+        self.times.append(timestamp)
+        self.skills.append(skill)
+        self.states.append(1 if completed else 0)
+
+    def _range(self, start, end):
+        """Return the slice of event positions with start <= time < end."""
+        return bisect_left(self.times, start), bisect_left(self.times, end)
+
+    def _search(self, positions, timestamp):
+        """Return the first index into positions whose event is at or after timestamp."""
+        low, high = 0, len(positions)
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[positions[middle]] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def events(self, start, end):
+        """Yield (time, key, completed) for the events in [start, end)."""
+        first, last = self._range(start, end)
+        for i in range(first, last):
+            yield self.times[i], self.keys[self.skills[i]], bool(self.states[i])
+
+    def completed_between(self, start, end):
+        """Return the keys whose last event in [start, end) was a completion."""
+        first, last = self._range(start, end)
+        latest = {}
+        for i in range(first, last):
+            latest[self.skills[i]] = self.states[i]
+        return [self.keys[skill] for skill, state in latest.items() if state]
+
+    def subtree_activity(self, keys, start, end, bucket):
+        """Count completions and un-completions per time bucket under a subtree.
+
+        keys are the stable IDs of the subtree's skills. Returns a list of
+        (bucket_start, completed, uncompleted) covering [start, end).
+        """
+        count = max(1, int((end - start + bucket - 1) // bucket))
+        completed = [0] * count
+        uncompleted = [0] * count
+
+        for key in keys:
+            skill = self.key_ids.get(key)
+            if skill is None:
+                continue
+
+            # This skill's events are in time order, so binary search its own list
+            positions = self.positions[skill]
+            first = self._search(positions, start)
+            last = self._search(positions, end)
+            for i in positions[first:last]:
+                index = int((self.times[i] - start) // bucket)
+                if self.states[i]:
+                    completed[index] += 1
+                else:
+                    uncompleted[index] += 1
+
+        return [(start + i * bucket, completed[i], uncompleted[i]) for i in range(count)]
+
+    def save(self, file_path):
+        """Write the log to file_path: a header, the skill table, then the raw columns."""
+        table = json.dumps(self.keys).encode('utf-8')
+        columns = (self.times, self.skills, self.states)
+        if sys.byteorder == "big":
+            # The file is little-endian; swap copies so the live columns stay usable
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+
+        with open(file_path, 'wb') as f:
+            f.write(HEADER.pack(HISTORY_MAGIC, len(self.keys), len(self.times), len(table)))
+            f.write(table)
+            for column in columns:
+                column.tofile(f)
+
+    @classmethod
+    def load(cls, file_path):
+        """Read a log written by save, or by versions that keyed it by path."""
+        history = cls()
+        with open(file_path, 'rb') as f:
+            magic, _, count, table_size = HEADER.unpack(f.read(HEADER.size))
+            if magic not in (HISTORY_MAGIC, PATH_HISTORY_MAGIC):
+                raise ValueError(f"{file_path} is not a completion history file")
+            history.keyed_by_path = magic == PATH_HISTORY_MAGIC
+
+            for key in json.loads(f.read(table_size).decode('utf-8')):
+                history._skill_id(key)
+            for column in (history.times, history.skills, history.states):
+                column.fromfile(f, count)
+
+        if sys.byteorder == "big":
+            for column in (history.times, history.skills, history.states):
+                column.byteswap()
+
+        # Rebuild the per-skill position lists
+        for i, skill in enumerate(history.skills):
+            history.positions[skill].append(i)
+        return history
@@ -0,0 +1,54 @@
+"""
+Stable Node IDs
+Gives every skill an ID that is saved with the tree and survives reloads,
+unlike Treeview item IDs. New IDs are derived from the parent's ID and the
+skill's name, so loading the same outline twice gives the same IDs.
+"""
+import hashlib
+
+
+def derive_id(parent_stable_id, text):
+    """Return the ID for a skill named text under the given parent ID."""
+    key = f"{parent_stable_id}/{text}".encode('utf-8')
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+
+class NodeIndex:
+    def __init__(self):
+        self.items = {}       # stable ID -> live item
+        self.stable_ids = {}  # live item -> stable ID
+
+    def __len__(self):
+        return len(self.items)
+
+    def assign(self, item, parent_item, text, stable_id=None):
+        """Register a new item, keeping stable_id if it is free, and return its ID."""
+        if not stable_id or stable_id in self.items:
+            stable_id = derive_id(self.stable_ids.get(parent_item, ""), text)
+            # Siblings with the same name get numbered variants
+            base, count = stable_id, 1
+            while stable_id in self.items:
+                count += 1
+                stable_id = f"{base}-{count}"
+
+        self.items[stable_id] = item
+        self.stable_ids[item] = stable_id
+        return stable_id
+
+    def remove(self, item):
+        """Forget a deleted item."""
+        stable_id = self.stable_ids.pop(item, None)
+        if stable_id is not None:
+            del self.items[stable_id]
+
+    def clear(self):
+        self.items.clear()
+        self.stable_ids.clear()
+
+    def item(self, stable_id):
+        """Return the live item with a stable ID, or None."""
+        return self.items.get(stable_id)
+
+    def stable_id(self, item):
+        """Return an item's stable ID, or None if it isn't registered."""
+        return self.stable_ids.get(item)
@@ -0,0 +1,284 @@
+"""
+Outline Parsing
+Helpers for reading skill trees written as indented text outlines
+in the math.txt format (2 spaces per level, optional leading dash).
+"""
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import io
+import json
+import os
+
+# Separator between skill names in a path such as "Algebra > Precalculus"
+PATH_SEPARATOR = " > "
+
+# Files smaller than this are parsed serially; process start-up would dominate
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+
+def outline_level(line):
+    """Return (level, text) for one outline line, or None for a blank line."""
+    if not line.strip():  # Skip empty lines
+        return None
+
+    # Calculate indentation level (count spaces at the beginning)
+    indent = 0
+    for char in line:
+        if char == ' ':
+            indent += 1
+        elif char == '\t':
+            indent += 4  # Treat tabs as 4 spaces
+        else:
+            break
+
+    # If line starts with a dash (after spaces), it's a child of the previous level
+    text = line.strip()
+    has_dash = text.startswith('- ')
+
+    # The text content (remove leading dash if present)
+    if has_dash:
+        text = text[2:]
+
+    # Calculate the actual level based on indentation and dash presence
+    if indent == 0 and not has_dash:
+        # Main category (like "Arithmetic & Pre-Algebra")
+        level = 0
+    elif has_dash:
+        # Line with a dash is a child of its indentation level
+        level = (indent // 2) + 1
+    else:
+        # Other indented lines without dash
+        level = indent // 2
+
+    return level, text
+
+
+def parse_outline(lines, model):
+    """Parse outline lines into a SkillModel and return it."""
+    # Dictionary to track parent nodes at each indentation level
+    parent_map = {}
+
+    for line in lines:
+        parsed = outline_level(line)
+        if parsed is None:
+            continue
+        level, text = parsed
+
+        parent = -1 if level == 0 else parent_map.get(level - 1, -1)
+        parent_map[level] = model.add_node(parent, text)
+
+    return model
+
+
+def write_outline(model, f):
+    """Write a SkillModel to f in the same indented format parse_outline reads."""
+    stack = list(reversed(model.roots))
+    while stack:
+        node = stack.pop()
+        depth = model.depth[node]
+        if depth == 0:
+            f.write(model.text[node] + "\n")
+        else:
+            f.write("  " * (depth - 1) + "- " + model.text[node] + "\n")
+        stack.extend(reversed(model.children[node]))
+
+
+def _is_top_level(raw_line):
+    """Check whether a raw outline line is a top-level category."""
+    try:
+        parsed = outline_level(raw_line.decode('utf-8'))
+    except UnicodeDecodeError:
+        return False
+    return parsed is not None and parsed[0] == 0
+
+
+def _chunk_boundaries(file_path, chunks):
+    """Split the file into byte ranges that each start at a top-level line."""
+    size = os.path.getsize(file_path)
+    boundaries = [0]
+
+    with open(file_path, 'rb') as f:
+        for i in range(1, chunks):
+            target = size * i // chunks
+            if target <= boundaries[-1]:
+                continue
+
+            # Move to the start of the next line, then on to the next category
+            f.seek(target - 1)
+            f.readline()
+            position = f.tell()
+            for raw_line in iter(f.readline, b''):
+                if _is_top_level(raw_line):
+                    break
+                position += len(raw_line)
+            else:
+                break
+
+            if position > boundaries[-1]:
+                boundaries.append(position)
+
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _parse_chunk(file_path, start, end):
+    """Parse one byte range into compact arrays (runs in a worker process).
+
+    Returns the node texts joined by newlines, the parent of each node as
+    an int array, and the chunk's final level-to-node map. Parents inside
+    the chunk are chunk-local indices, -1 is the root, and -2 - level means
+    "whatever node was at that level when the chunk started".
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    texts = []
+    parents = array('i')
+    parent_map = {}
+
+    for line in io.TextIOWrapper(io.BytesIO(data)):
+        parsed = outline_level(line)
+        if parsed is None:
+            continue
+        level, text = parsed
+
+        if level == 0:
+            parent = -1
+        else:
+            parent = parent_map.get(level - 1, -2 - (level - 1))
+        parent_map[level] = len(texts)
+        texts.append(text)
+        parents.append(parent)
+
+    return "\n".join(texts), parents.tobytes(), parent_map
+
+
+def parse_outline_parallel(file_path, model, workers=None):
+    """Parse an outline file across processes, split at top-level categories.
+
+    The result is identical to parse_outline on the same file.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or os.path.getsize(file_path) < PARALLEL_MIN_BYTES:
+        with open(file_path, 'r') as f:
+            return parse_outline(f, model)
+
+    # Several chunks per worker keeps the cores busy when sections differ in size
+    ranges = _chunk_boundaries(file_path, workers * 4)
+
+    # Level-to-node map carried across chunks, as in the serial parser
+    parent_map = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _parse_chunk,
+            [file_path] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges]
+        )
+
+        # Stitch the chunks back together in file order
+        for joined, parent_bytes, chunk_map in results:
+            if not parent_bytes:
+                continue
+            parents = array('i')
+            parents.frombytes(parent_bytes)
+            base = len(model)
+
+            # Rebase chunk-local parents and resolve ones left over from earlier chunks
+            parents = [
+                parent + base if parent >= 0
+                else -1 if parent == -1
+                else parent_map.get(-2 - parent, -1)
+                for parent in parents
+            ]
+            model.extend_nodes(parents, joined.split("\n"))
+
+            for level, node in chunk_map.items():
+                parent_map[level] = node + base
+
+    return model
+
+
+def build_section_index(file_path, levels=2):
+    """Map each node in the top levels to its byte offset and length in the file."""
+    sections = []
+    open_sections = []  # Entries whose subtree hasn't ended yet
+    path = []
+    offset = 0
+
+    with open(file_path, 'rb') as f:
+        for raw_line in f:
+            parsed = outline_level(raw_line.decode('utf-8'))
+            if parsed is not None:
+                level, text = parsed
+
+                # A line at this level ends every open section at the same or deeper level
+                while open_sections and open_sections[-1]["level"] >= level:
+                    entry = open_sections.pop()
+                    entry["length"] = offset - entry["offset"]
+
+                del path[level:]
+                path.extend([""] * (level - len(path)))
+                path.append(text)
+
+                if level < levels:
+                    entry = {"path": list(path), "level": level, "offset": offset, "length": 0}
+                    sections.append(entry)
+                    open_sections.append(entry)
+
+            offset += len(raw_line)
+
+    # Whatever is still open runs to the end of the file
+    for entry in open_sections:
+        entry["length"] = offset - entry["offset"]
+
+    return sections
+
+
+def load_section_index(file_path, levels=2):
+    """Return the section index for file_path, rebuilding the sidecar if stale."""
+    index_path = file_path + ".idx"
+    stat = os.stat(file_path)
+
+    # Reuse the sidecar while the outline is unchanged
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+            if (index["size"] == stat.st_size and index["mtime_ns"] == stat.st_mtime_ns
+                    and index["levels"] >= levels):
+                return index["sections"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    sections = build_section_index(file_path, levels)
+    index = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "levels": levels,
+        "sections": sections
+    }
+    try:
+        with open(index_path, 'w') as f:
+            json.dump(index, f)
+    except OSError:
+        # A read-only directory just means no caching
+        pass
+    return sections
+
+
+def read_section_lines(file_path, path):
+    """Read only the outline lines of the section at path (a list of skill names)."""
+    sections = load_section_index(file_path, max(len(path), 2))
+    for entry in sections:
+        if entry["path"] == path:
+            break
+    else:
+        raise KeyError(PATH_SEPARATOR.join(path))
+
+    with open(file_path, 'rb') as f:
+        f.seek(entry["offset"])
+        data = f.read(entry["length"])
+    return data.decode('utf-8').splitlines(keepends=True)
@@ -0,0 +1,133 @@
+"""
+Skill Prerequisites
+Cross-branch "needs" edges between skills, kept as a DAG. A per-skill
+count of unmet prerequisites lets the ready-to-learn set be updated in
+time proportional to the edges of the skill that changed.
+"""
+import json
+import os
+from collections import defaultdict, deque
+
+
+class PrerequisiteCycleError(ValueError):
+    """Raised when prerequisite edges would form a cycle."""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        super().__init__(f"Prerequisites form a cycle involving {len(nodes)} skills")
+
+
+class PrerequisiteGraph:
+    def __init__(self, is_completed):
+        # Called with a node to read its current completion status
+        self.is_completed = is_completed
+
+        self.needs = defaultdict(list)    # skill -> its prerequisites
+        self.unlocks = defaultdict(list)  # prerequisite -> skills that need it
+        self.unmet = defaultdict(int)     # skill -> prerequisites not yet completed
+
+        # Incomplete skills with prerequisites, all of which are completed
+        self.ready = set()
+
+    def edges(self):
+        """Yield (skill, prerequisite) pairs."""
+        for skill, needs in self.needs.items():
+            for prerequisite in needs:
+                yield skill, prerequisite
+
+    def _link(self, skill, prerequisite):
+        self.needs[skill].append(prerequisite)
+        self.unlocks[prerequisite].append(skill)
+        if not self.is_completed(prerequisite):
+            self.unmet[skill] += 1
+
+    def _refresh_ready(self, skill):
+        if self.unmet[skill] == 0 and not self.is_completed(skill):
+            self.ready.add(skill)
+        else:
+            self.ready.discard(skill)
+
+    def add_edge(self, skill, prerequisite):
+        """Make skill need prerequisite, refusing edges that would close a cycle."""
+        if prerequisite in self.needs.get(skill, ()):
+            return
+        if skill == prerequisite or self._reaches(prerequisite, skill):
+            raise PrerequisiteCycleError([skill, prerequisite])
+        self._link(skill, prerequisite)
+        self._refresh_ready(skill)
+
+    def _reaches(self, start, target):
+        """Check whether target is among the transitive prerequisites of start."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for prerequisite in self.needs.get(stack.pop(), ()):
+                if prerequisite == target:
+                    return True
+                if prerequisite not in seen:
+                    seen.add(prerequisite)
+                    stack.append(prerequisite)
+        return False
+
+    def load_edges(self, pairs):
+        """Add many (skill, prerequisite) edges, checking for cycles once at the end."""
+        added = []
+        for skill, prerequisite in dict.fromkeys(pairs):
+            self._link(skill, prerequisite)
+            added.append(skill)
+
+        cycle = self._find_cycle()
+        if cycle:
+            self.clear()
+            raise PrerequisiteCycleError(cycle)
+
+        for skill in added:
+            self._refresh_ready(skill)
+
+    def _find_cycle(self):
+        """Return the skills left over by a topological sort, i.e. those on or behind a cycle."""
+        # Kahn's algorithm over every node that has an edge
+        remaining = {node: len(needs) for node, needs in self.needs.items()}
+        queue = deque(node for node in self.unlocks if node not in remaining)
+        while queue:
+            for skill in self.unlocks.get(queue.popleft(), ()):
+                remaining[skill] -= 1
+                if remaining[skill] == 0:
+                    queue.append(skill)
+        return [node for node, count in remaining.items() if count]
+
+    def clear(self):
+        self.needs.clear()
+        self.unlocks.clear()
+        self.unmet.clear()
+        self.ready.clear()
+
+    def status_changed(self, node, completed):
+        """Record that node's completion flipped and return the skills it unlocks.
+
+        Takes time proportional to the number of skills that need node.
+        """
+        step = -1 if completed else 1
+        dependents = self.unlocks.get(node, ())
+        for skill in dependents:
+            self.unmet[skill] += step
+            self._refresh_ready(skill)
+        if node in self.needs:
+            self._refresh_ready(node)
+        return dependents
+
+    def is_locked(self, node):
+        """Check whether node still has prerequisites to complete."""
+        return self.unmet.get(node, 0) > 0
+
+
+def read_prerequisite_file(file_path):
+    """Read (skill path, prerequisite path) pairs from a JSON sidecar file."""
+    with open(file_path, 'r') as f:
+        return [tuple(pair) for pair in json.load(f)["prerequisites"]]
+
+
+def prerequisite_sidecar(file_path):
+    """Return the sidecar file that holds prerequisites for file_path, if any."""
+    sidecar = file_path + ".prereqs.json"
+    return sidecar if os.path.exists(sidecar) else None
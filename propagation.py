@@ -0,0 +1,125 @@
+"""
+Completion Propagation
+One engine for how marking a skill affects the rest of the tree, with
+selectable policies. It works through four callbacks, so the same rules
+drive the Treeview apps and the in-memory SkillModel.
+"""
+import math
+
+
+# Available policies:
+#   leaf-only  - only bottom-level skills are toggled; parents complete when all children are
+#   cascade    - any skill can be toggled and its whole subtree follows, then parents as above
+#   threshold  - like leaf-only, but parents complete once enough of their children are
+#   manual     - every skill is toggled on its own, nothing propagates
+POLICIES = ("leaf-only", "cascade", "threshold", "manual")
+
+
+class PropagationEngine:
+    def __init__(self, children_of, parent_of, is_completed, set_completed,
+                 policy="leaf-only", threshold=0.8):
+        # Tree access: parent_of returns None for top-level skills
+        self.children_of = children_of
+        self.parent_of = parent_of
+        self.is_completed = is_completed
+        self.set_completed = set_completed
+
+        self.policy = policy
+        self.threshold = threshold  # Fraction of children for the threshold policy
+
+    def describe(self):
+        """Return two lines telling users what can be marked and when parents complete."""
+        if self.policy in ("cascade", "manual"):
+            marking = "Any skill can be directly marked as completed"
+        else:
+            marking = "Only skills without children can be directly marked as completed"
+
+        if self.policy == "cascade":
+            marking += ", along with everything under it"
+        if self.policy == "manual":
+            parents = "Parents are never completed automatically"
+        elif self.policy == "threshold":
+            parents = f"A parent is automatically completed when {self.threshold:.0%} of its children are completed"
+        else:
+            parents = "A parent is automatically completed when all children are completed"
+        return marking + "\n" + parents
+
+    def can_toggle(self, node):
+        """Check whether the policy lets node be marked directly."""
+        if self.policy in ("cascade", "manual"):
+            return True
+        return not self.children_of(node)
+
+    def _set(self, node, status, changed):
+        if self.is_completed(node) != status:
+            self.set_completed(node, status)
+            changed.append(node)
+
+    def _parent_status(self, node):
+        """Return whether node counts as completed given its children."""
+        children = self.children_of(node)
+        if self.policy == "threshold":
+            done = sum(1 for child in children if self.is_completed(child))
+            return done >= math.ceil(self.threshold * len(children))
+        return all(self.is_completed(child) for child in children)
+
+    def _cascade(self, node, status, changed):
+        """Give every descendant of node the same status."""
+        stack = list(self.children_of(node))
+        while stack:
+            child = stack.pop()
+            self._set(child, status, changed)
+            stack.extend(self.children_of(child))
+
+    def _update_ancestors(self, node, changed):
+        """Re-evaluate every ancestor of node up to the top level."""
+        parent = self.parent_of(node)
+        while parent is not None:
+            self._set(parent, self._parent_status(parent), changed)
+            parent = self.parent_of(parent)
+
+    def toggle(self, node):
+        """Toggle node under the current policy and return the nodes that changed."""
+        if not self.can_toggle(node):
+            return []
+
+        changed = []
+        status = not self.is_completed(node)
+        self._set(node, status, changed)
+
+        if self.policy == "cascade":
+            self._cascade(node, status, changed)
+        if self.policy != "manual":
+            self._update_ancestors(node, changed)
+        return changed
+
+    def set_many(self, nodes, status):
+        """Give many nodes the same status, then re-evaluate each affected ancestor once."""
+        changed = []
+        nodes = [node for node in nodes if self.can_toggle(node)]
+
+        # Apply every change first
+        for node in nodes:
+            self._set(node, status, changed)
+            if self.policy == "cascade":
+                self._cascade(node, status, changed)
+        if self.policy == "manual":
+            return changed
+
+        # Find the affected ancestors and their depths, visiting each only once
+        depths = {None: -1}
+        for node in nodes:
+            chain = []
+            parent = self.parent_of(node)
+            while parent not in depths:
+                chain.append(parent)
+                parent = self.parent_of(parent)
+            for ancestor in reversed(chain):
+                depths[ancestor] = depths[parent] + 1
+                parent = ancestor
+        del depths[None]
+
+        # Re-evaluate bottom-up, so every child is settled before its parent
+        for ancestor in sorted(depths, key=depths.get, reverse=True):
+            self._set(ancestor, self._parent_status(ancestor), changed)
+        return changed
@@ -0,0 +1,198 @@
+"""
+Next-Up Recommendations
+An indexed priority queue over the incomplete bottom-level skills, so the
+best skill to study next can be kept current in O(log n) per change.
+"""
+
+
+class IndexedHeap:
+    """Binary min-heap with a position index, so any item can be re-keyed or removed."""
+
+    def __init__(self):
+        self.heap = []      # [key, item] pairs in heap order
+        self.position = {}  # item -> index in self.heap
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.position[heap[i][1]] = i
+        self.position[heap[j][1]] = j
+
+    def _sift_up(self, i):
+        while i:
+            parent = (i - 1) // 2
+            if self.heap[i][0] >= self.heap[parent][0]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        size = len(self.heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size and self.heap[child][0] < self.heap[smallest][0]:
+                    smallest = child
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+    def push(self, item, key):
+        """Insert item, or change its key if it is already queued."""
+        if item in self.position:
+            i = self.position[item]
+            self.heap[i][0] = key
+            self._sift_up(i)
+            self._sift_down(self.position[item])
+            return
+        self.heap.append([key, item])
+        self.position[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def remove(self, item):
+        """Remove item if it is queued."""
+        i = self.position.pop(item, None)
+        if i is None:
+            return
+        last = self.heap.pop()
+        if i < len(self.heap):
+            self.heap[i] = last
+            self.position[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self.position[last[1]])
+
+    def rebuild(self, key):
+        """Re-key every item with key(item) and restore the heap in O(n)."""
+        for entry in self.heap:
+            entry[0] = key(entry[1])
+        for i in range(len(self.heap) // 2 - 1, -1, -1):
+            self._sift_down(i)
+
+    def first(self, count):
+        """Return the count smallest items in order, without removing them."""
+        result = []
+        # Explore the heap from the root, always expanding the smallest frontier entry
+        frontier = IndexedHeap()
+        if self.heap:
+            frontier.push(0, self.heap[0][0])
+        while frontier.heap and len(result) < count:
+            i = frontier.heap[0][1]
+            frontier.remove(i)
+            result.append(self.heap[i][1])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self.heap):
+                    frontier.push(child, self.heap[child][0])
+        return result
+
+
+class NextUpQueue:
+    # Ways of ranking the incomplete skills, best first
+    RANKINGS = ("Tree order", "Shallowest first", "Finish a branch", "Highest weight")
+
+    def __init__(self, parent_of, tree_order, weight, ranking="Tree order"):
+        # Callbacks into the tree: an item's parent, its index path and user weight
+        self.parent_of = parent_of
+        self.tree_order = tree_order
+        self.weight = weight
+        self.ranking = ranking
+
+        self.heap = IndexedHeap()
+        self.order = {}    # item -> cached index path
+
+        # "Finish a branch" ranks parents by how many children they have queued,
+        # then each parent's children in tree order, so a change re-keys one parent
+        self.members = {}  # parent -> heap of its queued children by index path
+        self.branches = IndexedHeap()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _key(self, item):
+        order = self.order[item]
+        if self.ranking == "Shallowest first":
+            return (len(order), order)
+        if self.ranking == "Highest weight":
+            return (-self.weight(item), order)
+        # Tree order; "Finish a branch" is answered from self.branches
+        return (order,)
+
+    def _update_branch(self, parent):
+        """Re-key a parent after its number of queued children changed."""
+        members = self.members.get(parent)
+        if members:
+            # Ties go to the branch whose first queued skill comes first
+            self.branches.push(parent, (len(members), members.heap[0][0]))
+        else:
+            self.members.pop(parent, None)
+            self.branches.remove(parent)
+
+    def add(self, item):
+        """Queue an incomplete bottom-level skill."""
+        if item in self.heap:
+            return
+        parent = self.parent_of(item)
+        order = self.order[item] = self.tree_order(item)
+        self.members.setdefault(parent, IndexedHeap()).push(item, order)
+        self.heap.push(item, self._key(item))
+        self._update_branch(parent)
+
+    def add_many(self, items):
+        """Queue many skills at once, building the heaps in a single pass."""
+        for item in items:
+            if item in self.heap:
+                continue
+            order = self.order[item] = self.tree_order(item)
+            members = self.members.setdefault(self.parent_of(item), IndexedHeap())
+            members.position[item] = len(members.heap)
+            members.heap.append([order, item])
+            self.heap.position[item] = len(self.heap.heap)
+            self.heap.heap.append([None, item])
+        self.heap.rebuild(self._key)
+
+        self.branches = IndexedHeap()
+        for parent, members in self.members.items():
+            members.rebuild(self.order.__getitem__)
+            self.branches.position[parent] = len(self.branches.heap)
+            self.branches.heap.append([None, parent])
+        self.branches.rebuild(lambda parent: (len(self.members[parent]), self.members[parent].heap[0][0]))
+
+    def discard(self, item):
+        """Drop an item that was completed or stopped being a bottom-level skill."""
+        if item not in self.heap:
+            return
+        parent = self.parent_of(item)
+        self.heap.remove(item)
+        del self.order[item]
+        self.members[parent].remove(item)
+        self._update_branch(parent)
+
+    def clear(self):
+        self.heap = IndexedHeap()
+        self.order.clear()
+        self.members.clear()
+        self.branches = IndexedHeap()
+
+    def set_ranking(self, ranking):
+        """Switch to another ranking, re-keying the queued items in one pass."""
+        self.ranking = ranking
+        self.heap.rebuild(self._key)
+
+    def first(self, count):
+        """Return the count best items to study next."""
+        if self.ranking != "Finish a branch":
+            return self.heap.first(count)
+
+        # Each parent has at least one queued child, so count parents are enough
+        result = []
+        for parent in self.branches.first(count):
+            result.extend(self.members[parent].first(count - len(result)))
+            if len(result) >= count:
+                break
+        return result
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Virtualized Skill Tree View
+A canvas-based alternative to the ttk.Treeview that only draws the rows
+inside the viewport, so scrolling cost doesn't depend on the tree size.
+"""
+import tkinter as tk
+from tkinter import ttk
+import json
+import os
+import sys
+from tkinter import filedialog, messagebox
+
+from compression import is_tree_file, open_tree_file
+from documents import PROGRESS_EXTENSION, DocumentCache, is_progress_file
+from outline import PATH_SEPARATOR
+from skill_model import SkillModel
+
+
+class SkillCanvas(ttk.Frame):
+    ROW_HEIGHT = 28
+    INDENT = 20
+
+    def __init__(self, master, model, font=("Georgia", 12), **kwargs):
+        super().__init__(master, **kwargs)
+        self.model = model
+        self.font = font
+
+        # Flattened index of the rows that are currently visible
+        self.rows = model.visible_descendants(-1)
+
+        # Scroll position in pixels from the top of the first row
+        self.offset = 0
+
+        # Canvas items reused for each on-screen row
+        self.slots = []
+        self._redraw_pending = False
+
+        # Redraw whenever the model changes, however it was changed
+        self.subscription = model.events.subscribe(self._on_model_changed)
+
+        # Create scrollbar
+        self.scrollbar = ttk.Scrollbar(self, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Create the canvas
+        self.canvas = tk.Canvas(self, background="#ffffff", highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=tk.YES)
+
+        # Bind resizing, scrolling, expand/collapse and completion toggling
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.yview("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.yview("scroll", 3, "units"))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Double-1>", self.toggle_completion)
+
+    def _row_at(self, y):
+        """Return the visible-row index under canvas y, or None."""
+        row = (self.offset + y) // self.ROW_HEIGHT
+        if 0 <= row < len(self.rows):
+            return row
+        return None
+
+    def _on_configure(self, event):
+        """Resize the pool of row items to fit the new height."""
+        needed = event.height // self.ROW_HEIGHT + 2
+        while len(self.slots) < needed:
+            self.slots.append((
+                self.canvas.create_rectangle(0, 0, 0, 0, width=0),
+                self.canvas.create_text(0, 0, anchor=tk.CENTER, font=self.font),
+                self.canvas.create_text(0, 0, anchor=tk.W, font=self.font)
+            ))
+        self.yview("scroll", 0, "units")
+
+    def _on_mousewheel(self, event):
+        # Windows and macOS report wheel direction in event.delta
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
+
+    def _on_click(self, event):
+        """Expand or collapse a row when its arrow is clicked."""
+        row = self._row_at(event.y)
+        if row is None:
+            return
+
+        node = self.rows[row]
+        arrow_x = self.model.depth[node] * self.INDENT
+        if self.model.children[node] and arrow_x <= event.x < arrow_x + self.INDENT:
+            self.toggle_open(row)
+
+    def yview(self, *args):
+        """Scrollbar protocol: moveto a fraction or scroll by units/pages."""
+        height = self.canvas.winfo_height()
+        total = len(self.rows) * self.ROW_HEIGHT
+
+        if args and args[0] == "moveto":
+            self.offset = int(float(args[1]) * total)
+        elif args and args[0] == "scroll":
+            step = self.ROW_HEIGHT if args[2] == "units" else height
+            self.offset += int(args[1]) * step
+
+        # Keep the viewport inside the rows
+        self.offset = max(0, min(self.offset, total - height))
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + height) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.schedule_redraw()
+
+    def toggle_open(self, row):
+        """Expand or collapse the node at row, splicing only its subtree."""
+        node = self.rows[row]
+
+        if self.model.open[node]:
+            # Drop the rows below it that belong to its subtree
+            depth = self.model.depth[node]
+            end = row + 1
+            while end < len(self.rows) and self.model.depth[self.rows[end]] > depth:
+                end += 1
+            del self.rows[row + 1:end]
+            self.model.open[node] = 0
+        else:
+            self.model.open[node] = 1
+            self.rows[row + 1:row + 1] = self.model.visible_descendants(node)
+
+        self.yview("scroll", 0, "units")
+
+    def toggle_completion(self, event):
+        """Toggle the completion status of a skill."""
+        row = self._row_at(event.y)
+        if row is None:
+            return
+
+        node = self.rows[row]
+        if not self.model.is_leaf(node):
+            print(f"Cannot directly mark '{self.model.text[node]}' as completed - only bottom-level skills can be marked")
+            return
+
+        self.model.toggle(node)
+
+    def _on_model_changed(self, batch):
+        """Refresh the row index if nodes were added, then redraw."""
+        if batch.loaded or batch.inserted or batch.removed:
+            self.rows = self.model.visible_descendants(-1)
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        """Coalesce redraw requests into one pass per idle cycle."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        """Reconfigure the pooled items for the rows in the viewport."""
+        self._redraw_pending = False
+        width = self.canvas.winfo_width()
+        first = self.offset // self.ROW_HEIGHT
+        shift = self.offset % self.ROW_HEIGHT
+
+        for index, (rect, arrow, label) in enumerate(self.slots):
+            row = first + index
+            if row >= len(self.rows):
+                for item in (rect, arrow, label):
+                    self.canvas.itemconfigure(item, state=tk.HIDDEN)
+                continue
+
+            node = self.rows[row]
+            y = index * self.ROW_HEIGHT - shift
+            x = self.model.depth[node] * self.INDENT
+
+            if self.model.completed[node]:
+                background, foreground = "#c8f7c5", "#006400"
+            else:
+                background, foreground = "#f7f7f7", "#000000"
+
+            if self.model.children[node]:
+                arrow_text = "▼" if self.model.open[node] else "▶"
+            else:
+                arrow_text = ""
+
+            self.canvas.coords(rect, 0, y, width, y + self.ROW_HEIGHT - 1)
+            self.canvas.itemconfigure(rect, fill=background, state=tk.NORMAL)
+            self.canvas.coords(arrow, x + self.INDENT // 2, y + self.ROW_HEIGHT // 2)
+            self.canvas.itemconfigure(arrow, text=arrow_text, fill=foreground, state=tk.NORMAL)
+            self.canvas.coords(label, x + self.INDENT + 4, y + self.ROW_HEIGHT // 2)
+            self.canvas.itemconfigure(label, text=self.model.text[node], fill=foreground, state=tk.NORMAL)
+
+
+class DocumentTabs(ttk.Frame):
+    """One SkillCanvas per open document; documents with the same skills share their structure."""
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.cache = DocumentCache()
+        self.paths = {}  # Tab's SkillCanvas -> file it was opened from
+
+        # Create the buttons
+        buttons = ttk.Frame(self)
+        buttons.pack(fill=tk.X, pady=(0, 10))
+        ttk.Button(buttons, text="Open Tab", command=self.open_dialog).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Save Tab", command=self.save_current).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Save Progress As", command=self.save_progress_dialog).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Close Tab", command=self.close_current).pack(side=tk.LEFT, padx=5)
+
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill=tk.BOTH, expand=tk.YES)
+
+    def _views(self):
+        return [self.nametowidget(tab) for tab in self.notebook.tabs()]
+
+    def open_document(self, file_path):
+        """Open file_path in a new tab and return its view."""
+        model = self.cache.open(file_path)
+        sharing = sum(1 for view in self._views() if view.model.core is model.core)
+        print(f"Opened {file_path}: {len(model)} skills, structure shared with {sharing} other tabs")
+
+        view = SkillCanvas(self.notebook, model)
+        self.paths[view] = file_path
+        self.notebook.add(view, text=os.path.basename(file_path))
+        self.notebook.select(view)
+        return view
+
+    def open_dialog(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("JSON files", "*.json *.json.gz *.json.bz2 *.json.xz"),
+                ("Progress files", f"*{PROGRESS_EXTENSION}"),
+                ("All files", "*.*")
+            ],
+            title="Open Skill Tree"
+        )
+        if not file_path:
+            return
+        try:
+            self.open_document(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error opening file: {str(e)}")
+
+    def _current(self):
+        tab = self.notebook.select()
+        return self.nametowidget(tab) if tab else None
+
+    def save_current(self):
+        """Save the current tab back to its file, as a progress file or a whole JSON tree."""
+        view = self._current()
+        if view is None:
+            return
+        file_path = self.paths[view]
+        if is_progress_file(file_path):
+            self._save_progress(view, file_path)
+            return
+        if not is_tree_file(file_path):
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".json",
+                filetypes=[("JSON files", "*.json *.json.gz *.json.bz2 *.json.xz")],
+                title="Save Skill Tree"
+            )
+            if not file_path:
+                return
+        with open_tree_file(file_path, 'w') as f:
+            json.dump(view.model.to_json(), f, indent=4)
+        self.paths[view] = file_path
+        self.notebook.tab(view, text=os.path.basename(file_path))
+        print(f"Saved {file_path}")
+
+    def save_progress_dialog(self):
+        """Save just the current tab's completion and open flags to a new progress file."""
+        view = self._current()
+        if view is None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=PROGRESS_EXTENSION,
+            filetypes=[("Progress files", f"*{PROGRESS_EXTENSION}")],
+            title="Save Progress"
+        )
+        if file_path:
+            self._save_progress(view, file_path)
+
+    def _save_progress(self, view, file_path):
+        try:
+            self.cache.save_progress(view.model, file_path)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.paths[view] = file_path
+        self.notebook.tab(view, text=os.path.basename(file_path))
+        print(f"Saved progress to {file_path}")
+
+    def close_current(self):
+        """Close the current tab; a structure is freed once no tab uses it."""
+        view = self._current()
+        if view is None:
+            return
+        view.model.events.unsubscribe(view.subscription)
+        del self.paths[view]
+        view.destroy()
+
+
+def main():
+    # Several files after --tabs open side by side, sharing identical structures
+    if len(sys.argv) > 1 and sys.argv[1] == "--tabs":
+        root = tk.Tk()
+        root.title("Nested Skill Tree")
+        root.geometry("1000x800")
+
+        tabs = DocumentTabs(root, padding=10)
+        tabs.pack(fill=tk.BOTH, expand=tk.YES)
+        for file_path in sys.argv[2:]:
+            tabs.open_document(file_path)
+
+        root.mainloop()
+        return
+
+    # Load the tree given on the command line, or math.txt by default
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "math.txt"
+    if not os.path.exists(file_path):
+        print(f"{file_path} not found.")
+        return
+
+    # An optional section such as "Algebra > Elementary Algebra" loads just that subtree
+    section = sys.argv[2].split(PATH_SEPARATOR) if len(sys.argv) > 2 else None
+
+    model = SkillModel.from_file(file_path, section, workers=None)
+    print(f"Loaded {len(model)} skills from {file_path}")
+
+    root = tk.Tk()
+    root.title("Nested Skill Tree")
+    root.geometry("1000x800")
+
+    view = SkillCanvas(root, model, padding=10)
+    view.pack(fill=tk.BOTH, expand=tk.YES)
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Memory Diagnostics
+Reports how much memory a skill tree costs, per node and per component,
+as one JSON object per tree so results can be compared across runs.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import synthetic_model
+from outline import parse_outline, write_outline
+from skill_model import SkillModel
+
+
+def _rss_bytes():
+    """Return the resident set size of this process, or None if unavailable."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _measure(operation):
+    """Run operation and return its result with its time, retained and peak memory."""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = operation()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    return result, {
+        "seconds": round(seconds, 4),
+        "retained_bytes": current - before,
+        "peak_bytes": peak - before
+    }
+
+
+def model_footprint(model):
+    """Return (text_bytes, structure_bytes) for the Python objects of a model."""
+    text_bytes = sys.getsizeof(model.text) + sum(sys.getsizeof(text) for text in model.text)
+
+    structure_bytes = sum(sys.getsizeof(column) for column in (
+        model.parent, model.children, model.depth, model.completed, model.open, model.roots
+    ))
+    structure_bytes += sum(sys.getsizeof(children) for children in model.children)
+
+    # Node numbers above 256 are separate int objects, each counted once
+    large_ints = {id(node): node for node in model.parent if node > 256}
+    for children in model.children:
+        large_ints.update((id(node), node) for node in children if node > 256)
+    structure_bytes += sum(sys.getsizeof(node) for node in large_ints.values())
+
+    return text_bytes, structure_bytes
+
+
+def _read_json(file_path):
+    with open(file_path, 'r') as f:
+        return SkillModel.from_json(json.load(f))
+
+
+def _read_outline(file_path):
+    with open(file_path, 'r') as f:
+        return parse_outline(f.readlines(), SkillModel())
+
+
+def _write_json(model, file_path):
+    with open(file_path, 'w') as f:
+        json.dump(model.to_json(), f, indent=4)
+
+
+def _measure_model(json_path, outline_path, save_path):
+    """Measure the load and save paths on the in-memory model, without Tk."""
+    model, load_tree = _measure(lambda: _read_json(json_path))
+    _, load_from_text_file = _measure(lambda: _read_outline(outline_path))
+    _, save_tree = _measure(lambda: _write_json(model, save_path))
+    operations = {
+        "load_tree": load_tree,
+        "load_from_text_file": load_from_text_file,
+        "save_tree": save_tree
+    }
+    return model, operations, None, None
+
+
+def _measure_tk(json_path, outline_path, save_path):
+    """Measure the app's own load and save methods on a hidden window."""
+    import tkinter as tk
+    from skill_tree import SkillTreeApp
+
+    root = tk.Tk()
+    root.withdraw()
+    app = SkillTreeApp(root)
+
+    def clear():
+        # Reset the app's indexes along with the items
+        app._clear_tree()
+        root.update_idletasks()
+
+    clear()
+    empty_rss = _rss_bytes()
+    _, load_tree = _measure(lambda: app.read_tree_file(json_path))
+    root.update_idletasks()
+    loaded_rss = _rss_bytes()
+
+    items = []
+    app._get_all_items("", items)
+    widget_items = len(items)
+    del items
+
+    _, save_tree = _measure(lambda: app.write_tree_file(save_path))
+
+    clear()
+    _, load_from_text_file = _measure(lambda: app.load_from_text_file(outline_path))
+    root.destroy()
+
+    # Tk keeps its items outside the Python heap, so they only show up in RSS
+    widget_bytes = None
+    if empty_rss is not None and loaded_rss is not None:
+        widget_bytes = max(0, loaded_rss - empty_rss - load_tree["retained_bytes"])
+
+    operations = {
+        "load_tree": load_tree,
+        "load_from_text_file": load_from_text_file,
+        "save_tree": save_tree
+    }
+    return _read_json(json_path), operations, widget_items, widget_bytes
+
+
+def memory_report(source, model, use_tk=False):
+    """Build the memory report for one tree as a JSON-ready dictionary."""
+    with tempfile.TemporaryDirectory() as directory:
+        # Both load paths are measured, so the tree is written in both formats
+        json_path = os.path.join(directory, "tree.json")
+        outline_path = os.path.join(directory, "tree.txt")
+        save_path = os.path.join(directory, "saved.json")
+        _write_json(model, json_path)
+        with open(outline_path, 'w') as f:
+            write_outline(model, f)
+        del model
+
+        tracemalloc.start()
+        try:
+            measure = _measure_tk if use_tk else _measure_model
+            model, operations, widget_items, widget_bytes = measure(json_path, outline_path, save_path)
+        finally:
+            tracemalloc.stop()
+
+    nodes = len(model)
+    text_bytes, structure_bytes = model_footprint(model)
+    load = operations["load_tree"]
+    components = {
+        "text": text_bytes,
+        "structure": structure_bytes,
+        "widget_items": widget_bytes,
+        "transient_load_buffers": load["peak_bytes"] - load["retained_bytes"]
+    }
+
+    return {
+        "source": source,
+        "mode": "tk" if use_tk else "model",
+        "nodes": nodes,
+        "widget_item_count": widget_items,
+        "components_bytes": components,
+        "bytes_per_node": {
+            name: round(value / nodes, 1) if value is not None and nodes else None
+            for name, value in components.items()
+        },
+        "operations": operations
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the memory cost of skill trees as JSON lines.")
+    parser.add_argument("files", nargs="*", help="saved JSON trees or text outlines to measure")
+    parser.add_argument("--nodes", type=int, nargs="*", default=[],
+                        help="also measure synthetic trees of these sizes, e.g. 10000 100000 1000000")
+    parser.add_argument("--tk", action="store_true",
+                        help="measure the app's Treeview methods (needs a display)")
+    args = parser.parse_args()
+
+    sources = [(file_path, lambda file_path=file_path: SkillModel.from_file(file_path)) for file_path in args.files]
+    sources += [(f"synthetic:{count}", lambda count=count: synthetic_model(count)) for count in args.nodes]
+    if not sources:
+        sources = [("math.txt", lambda: SkillModel.from_file("math.txt"))]
+
+    for source, load in sources:
+        print(json.dumps(memory_report(source, load(), args.tk)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Skill Tree Exporters
+Stream a skill tree to Markdown, HTML, OPML or Graphviz DOT, writing
+each node as it is visited rather than building the document first.
+
+Exporters take a SkillModel, or a LiveTree reading a tree held elsewhere
+(such as the app's Treeview) without copying it.
+"""
+from array import array
+import argparse
+import html
+import os
+from xml.sax.saxutils import quoteattr
+
+from skill_model import SkillModel
+
+
+class _Lookup:
+    """Read-only model[key] access through a function."""
+
+    __slots__ = ("get",)
+
+    def __init__(self, get):
+        self.get = get
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+
+class LiveTree:
+    """The parts of SkillModel the exporters use, read through functions.
+
+    Nodes are whatever the functions take, with "" as the parent of the
+    top-level ones.
+    """
+
+    def __init__(self, children_of, parent_of, text_of, completed_of, open_of):
+        self.roots = children_of("")
+        self.children = _Lookup(children_of)
+        self.text = _Lookup(text_of)
+        self.completed = _Lookup(completed_of)
+        self.open = _Lookup(open_of)
+        self.parent_of = parent_of
+        self.depth = _Lookup(self._depth)
+
+    def _depth(self, node):
+        depth = 0
+        node = self.parent_of(node)
+        while node:
+            depth += 1
+            node = self.parent_of(node)
+        return depth
+
+
+def _walk(model):
+    """Yield (node, entering) pairs in display order, entering=False after a subtree."""
+    stack = [(node, True) for node in reversed(model.roots)]
+    while stack:
+        node, entering = stack.pop()
+        yield node, entering
+        if entering and model.children[node]:
+            stack.append((node, False))
+            stack.extend((child, True) for child in reversed(model.children[node]))
+
+
+def leaf_progress(model):
+    """Return (done, total) counting completed and total leaves under each node.
+
+    They are arrays for a SkillModel and dicts for a LiveTree.
+    """
+    if isinstance(model, LiveTree):
+        done, total = {}, {}
+        # Leaves are only entered, and a parent is left after all its children
+        for node, entering in _walk(model):
+            children = model.children[node]
+            if not children:
+                total[node] = 1
+                done[node] = int(model.completed[node])
+            elif not entering:
+                total[node] = sum(total[child] for child in children)
+                done[node] = sum(done[child] for child in children)
+        return done, total
+
+    done = array('l', bytes(len(model) * array('l').itemsize))
+    total = array('l', bytes(len(model) * array('l').itemsize))
+
+    # Children are always numbered after their parents, so one reverse pass suffices
+    for node in range(len(model) - 1, -1, -1):
+        if not model.children[node]:
+            total[node] = 1
+            done[node] = model.completed[node]
+        parent = model.parent[node]
+        if parent >= 0:
+            total[parent] += total[node]
+            done[parent] += done[node]
+
+    return done, total
+
+
+def export_markdown(model, f, progress=None):
+    """Write the tree as a nested Markdown checklist."""
+    for node, entering in _walk(model):
+        if not entering:
+            continue
+        mark = "x" if model.completed[node] else " "
+        line = f"{'  ' * model.depth[node]}- [{mark}] {model.text[node]}"
+        if progress and model.children[node]:
+            line += f" ({progress[0][node]}/{progress[1][node]})"
+        f.write(line + "\n")
+
+
+def export_html(model, f, progress=None, title="Nested Skill Tree"):
+    """Write the tree as a static HTML page with collapsible subtrees."""
+    f.write(
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n"
+        "<style>\n"
+        "body { font-family: Georgia, serif; }\n"
+        "ul { list-style: none; }\n"
+        ".completed { background: #c8f7c5; color: #006400; }\n"
+        ".not_completed { background: #f7f7f7; }\n"
+        "</style>\n</head>\n<body>\n"
+        f"<h1>{html.escape(title)}</h1>\n<ul>\n"
+    )
+
+    for node, entering in _walk(model):
+        indent = "  " * model.depth[node]
+        if not entering:
+            f.write(f"{indent}</ul></details></li>\n")
+            continue
+
+        tag = "completed" if model.completed[node] else "not_completed"
+        label = html.escape(model.text[node])
+        if progress and model.children[node]:
+            label += f" ({progress[0][node]}/{progress[1][node]})"
+
+        if model.children[node]:
+            is_open = " open" if model.open[node] else ""
+            f.write(f"{indent}<li><details{is_open}><summary class=\"{tag}\">{label}</summary><ul>\n")
+        else:
+            f.write(f"{indent}<li class=\"{tag}\">{label}</li>\n")
+
+    f.write("</ul>\n</body>\n</html>\n")
+
+
+def export_opml(model, f, progress=None, title="Nested Skill Tree"):
+    """Write the tree as an OPML 2.0 outline."""
+    f.write(
+        "<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<opml version=\"2.0\">\n"
+        f"<head><title>{html.escape(title)}</title></head>\n<body>\n"
+    )
+
+    for node, entering in _walk(model):
+        indent = "  " * (model.depth[node] + 1)
+        if not entering:
+            f.write(f"{indent}</outline>\n")
+            continue
+
+        attributes = f"text={quoteattr(model.text[node])} completed=\"{'true' if model.completed[node] else 'false'}\""
+        if progress and model.children[node]:
+            attributes += f" done=\"{progress[0][node]}\" total=\"{progress[1][node]}\""
+        if model.children[node]:
+            f.write(f"{indent}<outline {attributes}>\n")
+        else:
+            f.write(f"{indent}<outline {attributes}/>\n")
+
+    f.write("</body>\n</opml>\n")
+
+
+def _dot_string(text):
+    """Quote a string for use as a DOT identifier or label."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def export_dot(model, f, progress=None):
+    """Write the tree as a Graphviz DOT digraph."""
+    f.write(
+        "digraph skills {\n"
+        "  rankdir=LR;\n"
+        "  node [shape=box, style=filled, fontname=\"Georgia\"];\n"
+    )
+
+    for node, entering in _walk(model):
+        if not entering:
+            continue
+
+        label = model.text[node]
+        if progress and model.children[node]:
+            label += f" ({progress[0][node]}/{progress[1][node]})"
+        if model.completed[node]:
+            colours = "fillcolor=\"#c8f7c5\", fontcolor=\"#006400\""
+        else:
+            colours = "fillcolor=\"#f7f7f7\""
+        f.write(f"  n{node} [label={_dot_string(label)}, {colours}];\n")
+        for child in model.children[node]:
+            f.write(f"  n{node} -> n{child};\n")
+
+    f.write("}\n")
+
+
+# Exporters by format name, with the file extensions that select them
+EXPORTERS = {
+    "markdown": export_markdown,
+    "html": export_html,
+    "opml": export_opml,
+    "dot": export_dot
+}
+EXTENSIONS = {
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".html": "html",
+    ".htm": "html",
+    ".opml": "opml",
+    ".dot": "dot",
+    ".gv": "dot"
+}
+
+
+def export_tree(model, file_path, export_format=None, progress=False):
+    """Export a model to file_path, picking the format from its extension if not given."""
+    if export_format is None:
+        export_format = EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+        if export_format is None:
+            raise ValueError(f"Can't tell the export format of {file_path}")
+
+    aggregates = leaf_progress(model) if progress else None
+    with open(file_path, 'w', encoding='utf-8') as f:
+        EXPORTERS[export_format](model, f, aggregates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a skill tree without opening the app.")
+    parser.add_argument("source", help="saved JSON tree or indented text outline (e.g. math.txt)")
+    parser.add_argument("target", help="output file; the format follows its extension")
+    parser.add_argument("--format", choices=sorted(EXPORTERS), help="override the output format")
+    parser.add_argument("--progress", action="store_true", help="include completed/total leaf counts")
+    args = parser.parse_args()
+
+    model = SkillModel.from_file(args.source, workers=None)
+    export_tree(model, args.target, args.format, args.progress)
+    print(f"Exported {len(model)} skills to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
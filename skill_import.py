@@ -0,0 +1,162 @@
+"""
+Skill Tree Importers
+Streaming readers for OPML, Markdown checklists and outlines. Each reader
+yields (line_number, level, text, completed) records one line at a time,
+and build_tree turns any of them into a SkillModel.
+"""
+import os
+import re
+from xml.parsers import expat
+
+from outline import outline_level
+
+
+class ImportFormatError(ValueError):
+    """Raised when an imported file can't be read, with the offending line."""
+
+    def __init__(self, line, message):
+        self.line = line
+        if line is not None:
+            message = f"line {line}: {message}"
+        super().__init__(message)
+
+
+def read_indented_outline(f):
+    """Read the math.txt format (2 spaces per level, optional leading dash)."""
+    for line_number, line in enumerate(f, 1):
+        parsed = outline_level(line)
+        if parsed is not None:
+            yield line_number, parsed[0], parsed[1], False
+
+
+def read_tab_outline(f):
+    """Read an outline indented with one tab per level."""
+    for line_number, line in enumerate(f, 1):
+        text = line.strip()
+        if not text:  # Skip empty lines
+            continue
+
+        level = len(line) - len(line.lstrip('\t'))
+        if line[level] in '  ':
+            raise ImportFormatError(line_number, "spaces in the indentation of a tab-indented outline")
+        yield line_number, level, text, False
+
+
+# "- [x] Skill", "* [ ] Skill" or a plain "- Skill" bullet
+CHECKLIST_LINE = re.compile(r'( *)[-*+] (?:\[([ xX])\] )?(.*\S)')
+
+
+def read_markdown_checklist(f):
+    """Read a Markdown checklist where "- [x]" marks a completed skill."""
+    unit = None  # Spaces per level, taken from the first indented item
+
+    for line_number, line in enumerate(f, 1):
+        if not line.strip() or line.lstrip().startswith('#'):  # Skip blank lines and headings
+            continue
+
+        match = CHECKLIST_LINE.fullmatch(line.rstrip('\r\n'))
+        if not match:
+            raise ImportFormatError(line_number, "expected a list item such as '- [ ] Skill'")
+
+        indent = len(match.group(1))
+        if indent and unit is None:
+            unit = indent
+        if indent and indent % unit:
+            raise ImportFormatError(line_number, f"indentation is not a multiple of {unit} spaces")
+
+        level = indent // unit if indent else 0
+        yield line_number, level, match.group(3), match.group(2) in ('x', 'X')
+
+
+def read_opml(f):
+    """Read an OPML outline, feeding expat one chunk at a time so the document is never held whole."""
+    parser = expat.ParserCreate()
+    records = []  # Outlines found in the chunk just parsed
+    level = -1
+
+    def start(tag, attributes):
+        nonlocal level
+        if tag != "outline":
+            return
+        level += 1
+
+        text = attributes.get("text", attributes.get("title"))
+        if text is None:
+            raise ImportFormatError(parser.CurrentLineNumber, "outline has no text attribute")
+        completed = attributes.get("completed", attributes.get("_complete", "false")).lower() == "true"
+        records.append((parser.CurrentLineNumber, level, text, completed))
+
+    def end(tag):
+        nonlocal level
+        if tag == "outline":
+            level -= 1
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    try:
+        while True:
+            chunk = f.read(1 << 16)
+            parser.Parse(chunk, not chunk)
+            yield from records
+            records.clear()
+            if not chunk:
+                break
+    except expat.ExpatError as e:
+        raise ImportFormatError(e.lineno, f"invalid OPML: {expat.ErrorString(e.code)}") from None
+
+
+def build_tree(records, model):
+    """Add the nodes from a reader to model and return it."""
+    # The last node seen at each level, i.e. the current ancestor chain
+    stack = []
+
+    for line_number, level, text, completed in records:
+        if level > len(stack):
+            raise ImportFormatError(line_number, "indented more than one level below the previous skill")
+
+        del stack[level:]
+        parent = stack[-1] if stack else -1
+        stack.append(model.add_node(parent, text, completed))
+
+    model.refresh_parents()
+    return model
+
+
+# Readers by format name, and the extensions that select them
+READERS = {
+    "indented": read_indented_outline,
+    "tabs": read_tab_outline,
+    "markdown": read_markdown_checklist,
+    "opml": read_opml
+}
+EXTENSIONS = {
+    ".opml": "opml",
+    ".md": "markdown",
+    ".markdown": "markdown"
+}
+
+
+def sniff_outline_format(file_path):
+    """Tell a tab-indented outline from the math.txt format by its first indented line."""
+    with open(file_path, 'r') as f:
+        for line in f:
+            if line[:1] == '\t':
+                return "tabs"
+            if line[:1] == ' ':
+                return "indented"
+    return "indented"
+
+
+def import_file(file_path, model, import_format=None):
+    """Import file_path into model, picking the reader from its extension if not given."""
+    if import_format is None:
+        import_format = EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+        if import_format is None:
+            import_format = sniff_outline_format(file_path)
+
+    reader = READERS[import_format]
+    if import_format == "opml":
+        with open(file_path, 'rb') as f:
+            return build_tree(reader(f), model)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return build_tree(reader(f), model)
@@ -0,0 +1,215 @@
+"""
+Skill Tree Model
+An in-memory skill tree kept in flat per-node arrays, so that views
+which only draw part of the tree don't need a widget item per node.
+"""
+import json
+import os
+
+from compression import is_tree_file, open_tree_file
+from events import NODE_CHANGED, NODE_INSERTED, EventBus
+from outline import parse_outline, parse_outline_parallel, read_section_lines
+from propagation import PropagationEngine
+import skill_import
+
+
+class SkillModel:
+    def __init__(self):
+        # Per-node columns, indexed by node number
+        self.text = []
+        self.parent = []
+        self.children = []
+        self.depth = []
+        self.completed = bytearray()
+        self.open = bytearray()
+
+        # Top-level nodes in display order
+        self.roots = []
+
+        # StructureCore the structural columns are shared with, if any (see documents.py)
+        self.core = None
+
+        # Notifies views and other listeners of changes
+        self.events = EventBus()
+
+    def __len__(self):
+        return len(self.text)
+
+    def _own_structure(self):
+        """Copy a shared structure before changing it, so other documents keep theirs."""
+        if self.core is None:
+            return
+        self.text = list(self.text)
+        self.parent = list(self.parent)
+        self.children = [list(kids) for kids in self.children]
+        self.depth = list(self.depth)
+        self.roots = list(self.roots)
+        self.core = None
+
+    def add_node(self, parent, text, completed=False, is_open=False):
+        """Append a node under parent (-1 for top level) and return its number."""
+        self._own_structure()
+        node = len(self.text)
+        self.text.append(text)
+        self.parent.append(parent)
+        self.children.append([])
+        self.depth.append(self.depth[parent] + 1 if parent >= 0 else 0)
+        self.completed.append(1 if completed else 0)
+        self.open.append(1 if is_open else 0)
+
+        if parent >= 0:
+            self.children[parent].append(node)
+        else:
+            self.roots.append(node)
+        self.events.emit(NODE_INSERTED, node)
+        return node
+
+    def extend_nodes(self, parents, texts):
+        """Append many nodes at once, given their parents and texts in order."""
+        self._own_structure()
+        base = len(self.text)
+        count = len(texts)
+        self.text.extend(texts)
+        self.parent.extend(parents)
+        self.children.extend([] for _ in range(count))
+        self.completed.extend(bytes(count))
+        self.open.extend(bytes(count))
+
+        # Local names keep the per-node loop tight
+        children, depth, roots = self.children, self.depth, self.roots
+        for node, parent in enumerate(parents, base):
+            if parent >= 0:
+                children[parent].append(node)
+                depth.append(depth[parent] + 1)
+            else:
+                roots.append(node)
+                depth.append(0)
+        self.events.emit_many(NODE_INSERTED, range(base, base + count))
+
+    def child_nodes(self, node):
+        """Return the children of node, or the top-level nodes for -1."""
+        return self.children[node] if node >= 0 else self.roots
+
+    def is_leaf(self, node):
+        return not self.children[node]
+
+    def refresh_parents(self):
+        """Mark each parent completed exactly when all of its children are."""
+        # Children are numbered after their parents, so go backwards
+        for node in range(len(self.text) - 1, -1, -1):
+            if self.children[node]:
+                self.completed[node] = all(self.completed[child] for child in self.children[node])
+
+    def visible_descendants(self, node):
+        """Return the descendants of node that show when it is open, in display order."""
+        rows = []
+        stack = list(reversed(self.child_nodes(node)))
+        while stack:
+            current = stack.pop()
+            rows.append(current)
+            if self.open[current]:
+                stack.extend(reversed(self.children[current]))
+        return rows
+
+    def propagation(self, policy="leaf-only", threshold=0.8):
+        """Return a PropagationEngine working on this model."""
+        def set_completed(node, status):
+            self.completed[node] = 1 if status else 0
+            self.events.emit(NODE_CHANGED, node)
+
+        return PropagationEngine(
+            self.children.__getitem__,
+            lambda node: self.parent[node] if self.parent[node] >= 0 else None,
+            lambda node: self.completed[node] == 1,
+            set_completed,
+            policy,
+            threshold
+        )
+
+    def toggle(self, node, policy="leaf-only"):
+        """Toggle a skill's completion and return the nodes whose status changed."""
+        # Deliver the whole cascade to listeners as one batch
+        with self.events.batch():
+            return self.propagation(policy).toggle(node)
+
+    def to_json(self):
+        """Return the tree as the dictionary that save_tree writes."""
+        tree_data = {"children": []}
+
+        # Walk iteratively so very deep trees don't hit the recursion limit
+        stack = [(tree_data, node) for node in reversed(self.roots)]
+        while stack:
+            parent_data, node = stack.pop()
+            node_data = {
+                "text": self.text[node],
+                "completed": bool(self.completed[node]),
+                "open": bool(self.open[node]),
+                "children": []
+            }
+            parent_data["children"].append(node_data)
+            stack.extend((node_data, child) for child in reversed(self.children[node]))
+
+        return tree_data
+
+    @classmethod
+    def from_json(cls, tree_data):
+        """Build a model from the dictionary written by save_tree."""
+        model = cls()
+
+        # Walk iteratively so very deep trees don't hit the recursion limit
+        stack = [(-1, child) for child in reversed(tree_data.get("children", []))]
+        while stack:
+            parent, node_data = stack.pop()
+            node = model.add_node(
+                parent,
+                node_data["text"],
+                node_data.get("completed", False),
+                node_data.get("open", True)
+            )
+            for child_data in reversed(node_data.get("children", [])):
+                stack.append((node, child_data))
+
+        return model
+
+    @classmethod
+    def from_core(cls, core, completed=None, is_open=None):
+        """Build a model on a shared StructureCore with its own completion and open flags."""
+        model = cls()
+        model.core = core
+        model.text, model.parent, model.children = core.text, core.parent, core.children
+        model.depth, model.roots = core.depth, core.roots
+        model.completed = bytearray(completed) if completed is not None else bytearray(len(core))
+        model.open = bytearray(is_open) if is_open is not None else bytearray(len(core))
+        return model
+
+    @classmethod
+    def from_file(cls, file_path, section=None, workers=1):
+        """Load a model from a saved JSON tree (optionally .gz/.bz2/.xz), an
+        indented text outline, or any format skill_import can read.
+
+        For outlines, section is an optional path of skill names such as
+        ["Algebra"]; only that subtree is read, using the sidecar index.
+        Whole outlines are parsed across `workers` processes (None means
+        one per core).
+        """
+        if is_tree_file(file_path):
+            with open_tree_file(file_path, 'r') as f:
+                return cls.from_json(json.load(f))
+
+        import_format = skill_import.EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+        if import_format is None and skill_import.sniff_outline_format(file_path) == "tabs":
+            import_format = "tabs"
+
+        if import_format:
+            model = skill_import.import_file(file_path, cls(), import_format)
+        elif section:
+            model = parse_outline(read_section_lines(file_path, section), cls())
+        else:
+            model = parse_outline_parallel(file_path, cls(), workers)
+
+        # Expand the top two levels, like load_from_text_file does
+        for node in model.roots:
+            model.open[node] = 1
+            for child in model.children[node]:
+                model.open[child] = 1
+        return model
@@ -4,12 +4,38 @@ Nested Skill Tree Application
 A simple application that displays a hierarchical skill tree
 with the ability to mark skills as completed and collapse/expand subtrees.
 """
+import argparse
 import tkinter as tk
 from tkinter import ttk
 import json
 import os
+import time
 from tkinter import filedialog, messagebox
 
+from outline import PATH_SEPARATOR, outline_level, read_section_lines
+from skill_export import LiveTree, export_tree
+from skill_model import SkillModel
+from compression import open_tree_file
+from eviction import SubtreeEvictor
+from events import BULK_LOADED, NODE_CHANGED, NODE_INSERTED, EventBus
+from filters import FILTERS, TreeFilter
+from node_ids import NodeIndex
+from history import CompletionHistory
+from propagation import POLICIES, PropagationEngine
+from recommend import NextUpQueue
+from undo import UndoLog
+from sync import SyncClient, SyncHub
+from prerequisites import (
+    PrerequisiteCycleError, PrerequisiteGraph, prerequisite_sidecar, read_prerequisite_file
+)
+
+
+# How often collapsed subtrees are checked for eviction
+EVICTION_INTERVAL_MS = 10000
+
+# How often deltas are exchanged with sync peers; local changes are batched in between
+SYNC_INTERVAL_MS = 100
+
 
 class SkillTreeApp:
     def __init__(self, root):
@@ -30,22 +56,15 @@ class SkillTreeApp:
         )
         title_label.pack(pady=5)
         
-        # Add instructions
-        instructions = (
-            "Double-click on a bottom-level skill to mark it as completed/incomplete\n"
-            "Click on the arrows to expand/collapse subtrees\n"
-            "Only skills without children can be directly marked as completed\n"
-            "A parent is automatically completed when all children are completed"
-        )
-        instructions_label = ttk.Label(
+        # Add instructions, filled in once the completion policy is known
+        self.instructions = ttk.Label(
             self.title_frame,
-            text=instructions,
             justify=tk.LEFT,
             font=("Georgia", 11),
             foreground="#555555",
             wraplength=980
         )
-        instructions_label.pack(pady=8)
+        self.instructions.pack(pady=8)
         
         # Add a separator
         separator = ttk.Separator(self.root, orient="horizontal")
@@ -55,6 +74,66 @@ class SkillTreeApp:
         self.frame = ttk.Frame(self.root, padding=10)
         self.frame.pack(fill=tk.BOTH, expand=tk.YES)
         
+        # Create the "Next Up" panel on the right
+        self.next_up_frame = ttk.Frame(self.frame, padding=(10, 0, 0, 0))
+        self.next_up_frame.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        ttk.Label(
+            self.next_up_frame,
+            text="Next Up",
+            font=("Georgia", 14, "bold"),
+            foreground="#2e7d32"
+        ).pack(anchor=tk.W, pady=(0, 5))
+        
+        self.ranking_combo = ttk.Combobox(
+            self.next_up_frame,
+            values=NextUpQueue.RANKINGS,
+            state="readonly"
+        )
+        self.ranking_combo.current(0)
+        self.ranking_combo.pack(fill=tk.X, pady=(0, 5))
+        self.ranking_combo.bind("<<ComboboxSelected>>", self._change_ranking)
+        
+        self.next_up_list = tk.Listbox(self.next_up_frame, width=32, height=15, activestyle="none")
+        self.next_up_list.pack(fill=tk.Y, expand=tk.YES)
+        self.next_up_list.bind("<<ListboxSelect>>", self._on_next_up_select)
+        
+        # Completion rule picker
+        ttk.Label(self.next_up_frame, text="Completion Rule:").pack(anchor=tk.W, pady=(10, 5))
+        self.policy_combo = ttk.Combobox(self.next_up_frame, values=POLICIES, state="readonly")
+        self.policy_combo.current(0)
+        self.policy_combo.pack(fill=tk.X)
+        self.policy_combo.bind("<<ComboboxSelected>>", self._change_policy)
+        
+        # View filter picker and search box
+        ttk.Label(self.next_up_frame, text="Show:").pack(anchor=tk.W, pady=(10, 5))
+        self.filter_combo = ttk.Combobox(self.next_up_frame, values=FILTERS, state="readonly")
+        self.filter_combo.current(0)
+        self.filter_combo.pack(fill=tk.X, pady=(0, 5))
+        self.filter_combo.bind("<<ComboboxSelected>>", lambda event: self.change_filter())
+        
+        self.search_entry = ttk.Entry(self.next_up_frame)
+        self.search_entry.pack(fill=tk.X)
+        self.search_entry.bind("<Return>", lambda event: self.change_filter("Search"))
+        
+        # Level controls
+        ttk.Label(self.next_up_frame, text="Levels:").pack(anchor=tk.W, pady=(10, 5))
+        level_frame = ttk.Frame(self.next_up_frame)
+        level_frame.pack(fill=tk.X)
+        self.level_spinbox = ttk.Spinbox(level_frame, from_=1, to=99, width=4)
+        self.level_spinbox.set(3)
+        self.level_spinbox.pack(side=tk.LEFT)
+        ttk.Button(
+            level_frame,
+            text="Expand To",
+            command=lambda: self.expand_to_level(int(self.level_spinbox.get()))
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(
+            level_frame,
+            text="Collapse Below",
+            command=lambda: self.collapse_below_level(int(self.level_spinbox.get()))
+        ).pack(side=tk.LEFT)
+        
         # Create scrollbar
         self.scrollbar = ttk.Scrollbar(self.frame)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -63,7 +142,7 @@ class SkillTreeApp:
         self.tree = ttk.Treeview(
             self.frame, 
             yscrollcommand=self.scrollbar.set,
-            selectmode="none",
+            selectmode="extended",  # Shift/Ctrl-click to select several skills
             columns=("completed",),  # Only keep one hidden column for tracking status
             show="tree"  # Only show the tree part, no headings
         )
@@ -73,6 +152,7 @@ class SkillTreeApp:
         # Apply custom tag for alternating row colors
         self.tree.tag_configure('completed', background='#c8f7c5', foreground='#006400')  # Lighter green bg, darker green text
         self.tree.tag_configure('not_completed', background='#f7f7f7')  # Light gray
+        self.tree.tag_configure('locked', foreground='#9e9e9e')  # Prerequisites still to do
         
         self.tree.pack(fill=tk.BOTH, expand=tk.YES)
         
@@ -108,6 +188,29 @@ class SkillTreeApp:
         )
         collapse_all_button.pack(side=tk.LEFT, padx=5)
         
+        # Add buttons to work on several skills at once
+        select_leaves_button = ttk.Button(
+            self.button_frame,
+            text="Select Leaves",
+            command=self.select_subtree_leaves
+        )
+        select_leaves_button.pack(side=tk.LEFT, padx=5)
+        
+        mark_selected_button = ttk.Button(
+            self.button_frame,
+            text="Mark Selected",
+            command=self.mark_selected
+        )
+        mark_selected_button.pack(side=tk.LEFT, padx=5)
+        
+        # Add a button to show completion history
+        history_button = ttk.Button(
+            self.button_frame,
+            text="History",
+            command=self.show_history
+        )
+        history_button.pack(side=tk.LEFT, padx=5)
+        
         # Add save and load buttons
         save_button = ttk.Button(
             self.button_frame,
@@ -117,6 +220,20 @@ class SkillTreeApp:
         )
         save_button.pack(side=tk.RIGHT, padx=5)
         
+        export_button = ttk.Button(
+            self.button_frame,
+            text="Export",
+            command=self.export_tree
+        )
+        export_button.pack(side=tk.RIGHT, padx=5)
+        
+        import_button = ttk.Button(
+            self.button_frame,
+            text="Import",
+            command=self.import_tree
+        )
+        import_button.pack(side=tk.RIGHT, padx=5)
+        
         load_button = ttk.Button(
             self.button_frame,
             text="Load Tree",
@@ -125,11 +242,77 @@ class SkillTreeApp:
         )
         load_button.pack(side=tk.RIGHT, padx=5)
         
+        # Everything that isn't a widget
+        self._create_state()
+        self._show_instructions()
+        
         # Initialize the skill tree
         self.populate_tree()
         
         # Bind the completion toggle action to double-click
         self.tree.bind("<Double-1>", self.toggle_completion)
+        self.tree.bind("<Return>", lambda event: self.mark_selected())
+        
+        # Bind undo and redo
+        self.root.bind("<Control-z>", lambda event: self.undo())
+        self.root.bind("<Control-y>", lambda event: self.redo())
+        self.root.bind("<Control-Z>", lambda event: self.redo())
+        
+        # Track collapsed subtrees and evict idle ones every few seconds
+        self.tree.bind("<<TreeviewClose>>", self._on_item_close)
+        self.tree.bind("<<TreeviewOpen>>", self._on_item_open)
+        self.root.after(EVICTION_INTERVAL_MS, self._evict_idle_subtrees)
+    
+    def _create_state(self):
+        """Create the app's non-widget state, around self.tree and self.root."""
+        # Compression level for .json.gz/.bz2/.xz saves; None keeps the codec default
+        self.compression_level = None
+        
+        # Timestamped log of every completion change
+        self.history = CompletionHistory()
+        
+        # Stable IDs that are saved with the tree, and the live item for each
+        self.node_ids = NodeIndex()
+        
+        # Items at each depth (0 = top level), for expanding to a level
+        self.depth_index = []
+        
+        # Hides skills without deleting them; also knows the structure of hidden ones
+        self.filter = TreeFilter(self.tree, self._is_completed)
+        
+        # Drops the items under long-collapsed skills from the Treeview
+        self.evictor = SubtreeEvictor(max_live_items=200000, idle_seconds=120)
+        
+        # Rule for how marking one skill affects the rest of the tree
+        self.propagation = PropagationEngine(
+            self.filter.children_of,
+            lambda item_id: self.filter.parent_of(item_id) or None,
+            self._is_completed,
+            self._set_status,
+            policy="leaf-only"
+        )
+        
+        # Completion changes that can be undone, at most 200 actions back
+        self.undo_log = UndoLog(self._set_status, depth=200)
+        
+        # Cross-branch prerequisites between skills
+        self.prerequisites = PrerequisiteGraph(self._is_completed)
+        
+        # Incomplete bottom-level skills, best to study first
+        self.weights = {}
+        self.tree_orders = {"": ()}  # Item -> index path, recorded in one walk per load
+        self.child_counts = {}       # Item -> number of children, for indexing new ones
+        self.next_up = NextUpQueue(self.filter.parent_of, self._tree_order, lambda item_id: self.weights.get(item_id, 0))
+        self.next_up_items = []
+        
+        # Tree changes are broadcast here; the Next Up panel catches up at most every 50 ms
+        self.events = EventBus()
+        self.events.subscribe(self.filter.on_tree_changed)
+        self.events.subscribe(self._on_tree_changed, window=50, schedule=self.root.after)
+        
+        # Peer sync, started with start_sync; local deltas wait here for the next exchange
+        self.sync = None
+        self.sync_outbox = []
     
     def populate_tree(self):
         """Populate the tree with the skill tree structure from math.txt."""
@@ -141,6 +324,8 @@ class SkillTreeApp:
             print("math.txt not found. Using default skill tree.")
             # Fallback to the simple default tree if math.txt doesn't exist
             self._populate_default_tree()
+        
+        self.events.emit(BULK_LOADED)
     
     def _populate_default_tree(self):
         """Populate the tree with a simple default skill tree structure."""
@@ -159,23 +344,33 @@ class SkillTreeApp:
         # Expand top-level categories
         for item in [math, algebra]:
             self.tree.item(item, open=True)
+        
+        all_items = []
+        self._get_all_items("", all_items)
+        for item_id in all_items:
+            if self.node_ids.stable_id(item_id) is None:
+                self.node_ids.assign(item_id, self.tree.parent(item_id), self.tree.item(item_id, "text"))
+                self._index_depth(item_id, self._child_depth(self.tree.parent(item_id)))
     
-    def load_from_text_file(self, file_path):
-        """Load a skill tree from a text file with indentation."""
+    def load_from_text_file(self, file_path, section=None):
+        """Load a skill tree from a text file with indentation.
+        
+        If section is a path of skill names (e.g. ["Algebra"]), only that
+        subtree is read, by seeking to it through the sidecar index.
+        """
         try:
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
+            if section:
+                lines = read_section_lines(file_path, section)
+            else:
+                with open(file_path, 'r') as f:
+                    lines = f.readlines()
             
             # Parse the indented text file
             self._parse_indented_tree(lines)
+            self._load_prerequisites(file_path)
             
-            # Expand top-level items
-            for item in self.tree.get_children():
-                self.tree.item(item, open=True)
-                
-                # Also expand second-level items
-                for child in self.tree.get_children(item):
-                    self.tree.item(child, open=True)
+            # Expand top-level and second-level items
+            self.expand_to_level(3)
             
         except Exception as e:
             messagebox.showerror("Error", f"Error loading from text file: {str(e)}")
@@ -184,45 +379,22 @@ class SkillTreeApp:
     
     def _parse_indented_tree(self, lines):
         """Parse an indented text file and build the tree."""
-        # Dictionary to track parent nodes at each indentation level
+        # Dictionaries to track parent nodes and their depths at each indentation level
         parent_map = {}
+        depth_map = {}
         
         for line in lines:
-            if not line.strip():  # Skip empty lines
+            parsed = outline_level(line)
+            if parsed is None:  # Skip empty lines
                 continue
-                
-            # Calculate indentation level (count spaces at the beginning)
-            indent = 0
-            for char in line:
-                if char == ' ':
-                    indent += 1
-                elif char == '\t':
-                    indent += 4  # Treat tabs as 4 spaces
-                else:
-                    break
-            
-            # Normalize indentation to levels
-            # If line starts with a dash (after spaces), it's a child of the previous level
-            text = line.strip()
-            has_dash = text.startswith('- ')
+            level, text = parsed
             
-            # The text content (remove leading dash if present)
-            if has_dash:
-                text = text[2:]
-            
-            # Calculate the actual level based on indentation and dash presence
-            if indent == 0 and not has_dash:
-                # Main category (like "Arithmetic & Pre-Algebra")
-                level = 0
+            # Top-level categories hang off the root
+            if level == 0:
                 parent_id = ""
-            elif has_dash:
-                # Line with a dash is a child of its indentation level
-                level = (indent // 2) + 1
-                parent_id = parent_map.get(level - 1, "")
             else:
-                # Other indented lines without dash
-                level = indent // 2
                 parent_id = parent_map.get(level - 1, "")
+            depth = depth_map[level - 1] + 1 if parent_id else 0
             
             # Insert the node
             node_id = self.tree.insert(
@@ -232,9 +404,12 @@ class SkillTreeApp:
                 values=("False",), 
                 tags=('not_completed',)
             )
+            self.node_ids.assign(node_id, parent_id, text)
+            self._index_depth(node_id, depth)
             
             # Update the parent map for this level
             parent_map[level] = node_id
+            depth_map[level] = depth
     
     def toggle_completion(self, event):
         """Toggle the completion status of a skill."""
@@ -243,95 +418,144 @@ class SkillTreeApp:
         if not item_id:
             return
             
-        # Check if this item has children
-        children = self.tree.get_children(item_id)
-        if children:
+        # Check whether the completion rule lets this item be marked directly
+        if not self.propagation.can_toggle(item_id):
             # This is not a leaf node, show a message and return
             print(f"Cannot directly mark '{self.tree.item(item_id, 'text')}' as completed - only bottom-level skills can be marked")
             return
-            
-        # Get the current completion status
-        current_values = self.tree.item(item_id, "values")
-        if len(current_values) < 1:
-            return
-            
-        current_status = str(current_values[0])
         
-        # Toggle the status
-        if current_status == "True":
-            new_status = False
-            self.tree.item(item_id, tags=('not_completed',))
-        else:
-            new_status = True
-            self.tree.item(item_id, tags=('completed',))
-            
-        # Update the item (only store the status, no display character)
-        self.tree.item(item_id, values=(str(new_status),))
+        # Toggle the status and propagate it, announcing the changes as one batch
+        with self.events.batch():
+            changed = self.propagation.toggle(item_id)
+        self.undo_log.record(changed, [not self._is_completed(skill_id) for skill_id in changed])
+        self._share_status([item_id])
         
         # Add debugging message
-        print(f"Toggled item: {self.tree.item(item_id, 'text')}, new status: {new_status}")
+        print(f"Toggled item: {self.tree.item(item_id, 'text')}, new status: {self._is_completed(item_id)}, {len(changed)} skills changed")
         
-        # Check parent status
-        parent_id = self.tree.parent(item_id)
-        if parent_id:
-            self.update_parent(parent_id)
-            print(f"Updated parent: {self.tree.item(parent_id, 'text')}, all children completed: {self.tree.item(parent_id, 'values')[0]}")
+        if self.prerequisites.ready:
+            print(f"Ready to learn: {len(self.prerequisites.ready)} skills with all prerequisites completed")
+    
+    def _is_completed(self, item_id):
+        """Check whether an item is marked as completed."""
+        record = self.evictor.nodes.get(item_id)
+        if record is not None:
+            return record[2]
+        return self.tree.item(item_id, "values")[0] == "True"
     
-    def update_children(self, parent_id, status):
-        """Update all children to match parent's completion status."""
-        status_str = str(status)
+    def _item_text(self, item_id):
+        """Return an item's name, even if it is evicted."""
+        record = self.evictor.nodes.get(item_id)
+        if record is not None:
+            return record[1]
+        return self.tree.item(item_id, "text")
+    
+    def _is_open(self, item_id):
+        """Return whether an item is expanded, even if it is evicted."""
+        record = self.evictor.nodes.get(item_id)
+        if record is not None:
+            return record[3]
+        return bool(self.tree.item(item_id, "open"))
+    
+    def _status_tags(self, item_id, status):
+        """Return the tags for an item with the given completion status."""
+        if status:
+            return ('completed',)
+        if self.prerequisites.is_locked(item_id):
+            return ('not_completed', 'locked')
+        return ('not_completed',)
+    
+    def _set_status(self, item_id, status):
+        """Set an item's completion status and keep prerequisites up to date."""
+        self._ensure_live(item_id)
+        changed = self._is_completed(item_id) != status
+        self.tree.item(item_id, values=(str(status),), tags=self._status_tags(item_id, status))
         
-        # Get all children
-        children = self.tree.get_children(parent_id)
-        if not children:
-            return
+        if changed:
+            self.history.record(self.node_ids.stable_id(item_id), status)
+            self.events.emit(NODE_CHANGED, item_id)
             
-        # Update each child
-        for child_id in children:
-            # Update child's status
-            if status:
-                self.tree.item(child_id, tags=('completed',))
+            # Skills that need this one may have become locked or unlocked
+            for skill_id in self.prerequisites.status_changed(item_id, status):
+                if skill_id in self.evictor:
+                    continue  # Tagged when it is re-inserted
+                self.tree.item(skill_id, tags=self._status_tags(skill_id, self._is_completed(skill_id)))
+    
+    def select_subtree_leaves(self):
+        """Replace the selection with the bottom-level skills under it."""
+        leaves = []
+        stack = list(self.tree.selection())
+        while stack:
+            item_id = stack.pop()
+            if item_id in self.evictor.subtrees:
+                self._restore_subtree(item_id)
+            children = self.tree.get_children(item_id)
+            if children:
+                stack.extend(children)
             else:
-                self.tree.item(child_id, tags=('not_completed',))
-                
-            self.tree.item(child_id, values=(status_str,))
-            
-            # Recursively update descendants
-            self.update_children(child_id, status)
+                leaves.append(item_id)
+        self.tree.selection_set(leaves)
     
-    def update_parent(self, parent_id):
-        """Update parent status based on children's statuses."""
-        if not parent_id:
-            return
-            
-        # Check if all children are completed
-        children = self.tree.get_children(parent_id)
-        if not children:
+    def mark_selected(self):
+        """Mark all selected skills as completed, or all as incomplete if they
+        already are."""
+        items = [item_id for item_id in self.tree.selection() if self.propagation.can_toggle(item_id)]
+        if not items:
             return
-            
-        all_completed = True
-        for child_id in children:
-            child_values = self.tree.item(child_id, "values")
-            if len(child_values) < 1:
-                all_completed = False
-                break
-                
-            child_status = str(child_values[0])
-            if child_status != "True":
-                all_completed = False
-                break
-                
-        # Update parent status
-        self.tree.item(parent_id, values=(str(all_completed),))
         
-        # Update the tag
-        if all_completed:
-            self.tree.item(parent_id, tags=('completed',))
+        status = not all(self._is_completed(item_id) for item_id in items)
+        with self.events.batch():
+            changed = self.propagation.set_many(items, status)
+        self.undo_log.record(changed, [not self._is_completed(skill_id) for skill_id in changed])
+        self._share_status(items)
+        print(f"Marked {len(items)} skills, new status: {status}")
+    
+    def undo(self):
+        """Undo the last completion change."""
+        with self.events.batch():
+            changed = self.undo_log.undo()
+        self._share_status([skill_id for skill_id in changed if self.propagation.can_toggle(skill_id)])
+        if changed:
+            print(f"Undid a change to {len(changed)} skills")
+    
+    def redo(self):
+        """Redo the last undone completion change."""
+        with self.events.batch():
+            changed = self.undo_log.redo()
+        self._share_status([skill_id for skill_id in changed if self.propagation.can_toggle(skill_id)])
+        if changed:
+            print(f"Redid a change to {len(changed)} skills")
+    
+    def change_filter(self, mode=None):
+        """Show only the skills that pass a filter, or all of them for "All skills"."""
+        if mode is None:
+            mode = self.filter_combo.get()
         else:
-            self.tree.item(parent_id, tags=('not_completed',))
-            
-        # Recursively update ancestors
-        self.update_parent(self.tree.parent(parent_id))
+            self.filter_combo.set(mode)
+        
+        start = time.perf_counter()
+        if mode == "All skills":
+            self.filter.clear()
+        else:
+            # Filters work on Treeview items, so bring back any evicted ones
+            self._restore_all_subtrees()
+            self.filter.apply(mode, self.search_entry.get())
+        print(f"Filter '{mode}' applied in {time.perf_counter() - start:.3f}s")
+    
+    def _change_policy(self, event):
+        """Switch the completion rule used by toggles and bulk marking."""
+        self.propagation.policy = self.policy_combo.get()
+        self._show_instructions()
+    
+    def _show_instructions(self):
+        """Show the usage instructions, with the current policy's completion rules."""
+        self.instructions.configure(text=(
+            "Double-click on a skill to mark it as completed/incomplete\n"
+            "Shift/Ctrl-click to select several skills, then press Enter or \"Mark Selected\"\n"
+            "Ctrl+Z undoes the last change, Ctrl+Y redoes it\n"
+            "Click on the arrows to expand/collapse subtrees\n"
+            + self.propagation.describe()
+        ))
     
     def add_skill_dialog(self):
         """Open a dialog to add a new skill."""
@@ -369,19 +593,12 @@ class SkillTreeApp:
         # Parent selection
         ttk.Label(content_frame, text="Parent Skill:").grid(row=2, column=0, padx=10, pady=10, sticky=tk.W)
         
-        # Get all current items
-        all_items = []
-        self._get_all_items("", all_items)
-        
-        # Create a dictionary of item IDs to display names
-        self.item_dict = {}
-        for item_id in all_items:
-            self.item_dict[self.tree.item(item_id, "text")] = item_id
-        
-        # Add "Root" as an option
-        self.item_dict["[Root Level]"] = ""
+        # Map each skill's label to its stable ID, so same-named skills stay apart
+        self.item_dict = {"[Root Level]": ""}
+        for label, item_id in self._item_labels():
+            self.item_dict[label] = self.node_ids.stable_id(item_id)
         
-        # Create the combobox with all item names
+        # Create the combobox with all item paths
         parent_combo = ttk.Combobox(content_frame, values=list(self.item_dict.keys()), state="readonly")
         parent_combo.current(0)  # Select the first item
         parent_combo.grid(row=2, column=1, padx=10, pady=10, sticky=tk.W+tk.E)
@@ -409,88 +626,474 @@ class SkillTreeApp:
         if not skill_name:
             return
         
-        # Get the parent ID from the dictionary
-        parent_id = self.item_dict.get(parent_name, "")
+        # Get the parent from the dictionary, bringing it back if it was evicted
+        parent_id = self.node_ids.item(self.item_dict.get(parent_name, "")) or ""
+        self._ensure_live(parent_id)
+        if parent_id in self.evictor.subtrees:
+            self._restore_subtree(parent_id)
         
         # Insert the new skill
         new_item = self.tree.insert(parent_id, "end", text=skill_name, values=("False",), tags=('not_completed',))
+        stable_id = self.node_ids.assign(new_item, parent_id, skill_name)
+        self._index_depth(new_item, self._child_depth(parent_id))
+        self._share({"op": "add", "id": stable_id, "parent": self.node_ids.stable_id(parent_id) or "", "text": skill_name})
         
         # If it's a child, make sure the parent is expanded
         if parent_id:
             self.tree.item(parent_id, open=True)
         
+        self.events.emit(NODE_INSERTED, new_item)
+        
         # Close the dialog
         dialog.destroy()
     
+    def _tree_order(self, item_id):
+        """Return the index path of an item, which sorts in display order."""
+        order = self.tree_orders.get(item_id)
+        if order is None:
+            # Skills are only ever added at the end of their parent
+            parent_id = self.filter.parent_of(item_id)
+            parent_order = self._tree_order(parent_id)
+            index = self.child_counts.get(parent_id, 0)
+            self.child_counts[parent_id] = index + 1
+            order = self.tree_orders[item_id] = parent_order + (index,)
+        return order
+    
+    def _index_tree_order(self):
+        """Record every item's index path and child count in one preorder walk."""
+        self.tree_orders = {"": ()}
+        self.child_counts = {}
+        stack = [""]
+        while stack:
+            parent_id = stack.pop()
+            children = self.filter.children_of(parent_id)
+            self.child_counts[parent_id] = len(children)
+            prefix = self.tree_orders[parent_id]
+            for index, child in enumerate(children):
+                self.tree_orders[child] = prefix + (index,)
+            stack.extend(children)
+    
+    def _rebuild_next_up(self):
+        """Queue every incomplete bottom-level skill after a new tree is loaded."""
+        self.next_up.clear()
+        self._index_tree_order()
+        self.next_up.add_many(
+            item_id for item_id, count in self.child_counts.items()
+            if item_id and not count and not self._is_completed(item_id)
+        )
+    
+    def _on_tree_changed(self, batch):
+        """Bring the Next Up queue and panel up to date with a batch of changes."""
+        if batch.loaded:
+            self._rebuild_next_up()
+        else:
+            # Only incomplete bottom-level skills are recommended
+            for item_id in batch.changed | batch.inserted:
+                if self.filter.children_of(item_id) or self._is_completed(item_id):
+                    self.next_up.discard(item_id)
+                else:
+                    self.next_up.add(item_id)
+            
+            # A skill's parent is no longer a bottom-level skill
+            for item_id in batch.inserted:
+                self.next_up.discard(self.filter.parent_of(item_id))
+        self._refresh_next_up_panel()
+    
+    def _refresh_next_up_panel(self):
+        """Show the best few skills to study next."""
+        self.next_up_items = self.next_up.first(15)
+        self.next_up_list.delete(0, tk.END)
+        for item_id in self.next_up_items:
+            self.next_up_list.insert(tk.END, self._item_text(item_id))
+    
+    def _change_ranking(self, event):
+        """Re-rank the queue with the ranking picked in the combobox."""
+        self.next_up.set_ranking(self.ranking_combo.get())
+        self._refresh_next_up_panel()
+    
+    def _on_next_up_select(self, event):
+        """Reveal and select the skill clicked in the Next Up panel."""
+        selection = self.next_up_list.curselection()
+        if selection:
+            self.reveal_item(self.next_up_items[selection[0]])
+    
+    def reveal_item(self, item_id):
+        """Open an item's ancestors, scroll it into view and select it."""
+        # A filtered-out skill can't be shown, so drop the filter first
+        if not self.filter.is_shown(item_id):
+            self.change_filter("All skills")
+        self._ensure_live(item_id)
+        parent_id = self.tree.parent(item_id)
+        while parent_id:
+            self.tree.item(parent_id, open=True)
+            parent_id = self.tree.parent(parent_id)
+        self.tree.see(item_id)
+        self.tree.selection_set(item_id)
+        self.tree.focus(item_id)
+    
+    def show_history(self):
+        """Show recent completions and weekly progress per top-level category."""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Completion History")
+        dialog.geometry("700x500")
+        dialog.transient(self.root)
+        
+        text = tk.Text(dialog, wrap=tk.WORD, padx=15, pady=15, font=("Georgia", 11))
+        text.pack(fill=tk.BOTH, expand=tk.YES)
+        
+        week = 7 * 24 * 60 * 60
+        end = time.time() + 1
+        
+        # Skills completed in the last seven days
+        # Skills deleted since are left out
+        completed = [self.node_ids.item(key) for key in self.history.completed_between(end - week, end)]
+        completed = [item_id for item_id in completed if item_id is not None]
+        text.insert(tk.END, f"Completed in the last 7 days ({len(completed)})\n\n")
+        for item_id in completed:
+            text.insert(tk.END, f"  {self._item_path(item_id)}\n")
+        
+        # Net completions per week for each top-level category, oldest first
+        text.insert(tk.END, "\nCompletions per week, last 8 weeks\n\n")
+        for item_id in self.filter.children_of(""):
+            buckets = self.history.subtree_activity(self._subtree_keys(item_id), end - 8 * week, end, week)
+            counts = " ".join(f"{done - undone:+d}" for _, done, undone in buckets)
+            text.insert(tk.END, f"  {self._item_text(item_id)}: {counts}\n")
+        
+        text.configure(state=tk.DISABLED)
+    
+    def _subtree_keys(self, item_id):
+        """Yield the stable IDs of an item and all its descendants."""
+        stack = [item_id]
+        while stack:
+            item_id = stack.pop()
+            yield self.node_ids.stable_id(item_id)
+            stack.extend(self.filter.children_of(item_id))
+    
     def _get_all_items(self, parent_id, items_list):
         """Recursively get all items in the tree."""
-        for item_id in self.tree.get_children(parent_id):
+        for item_id in self.filter.children_of(parent_id):
             items_list.append(item_id)
             self._get_all_items(item_id, items_list)
     
+    def _index_depth(self, item_id, depth):
+        """Add a newly inserted item to the per-depth index."""
+        while len(self.depth_index) <= depth:
+            self.depth_index.append([])
+        self.depth_index[depth].append(item_id)
+    
+    def _child_depth(self, parent_id):
+        """Return the depth of a new child of parent_id, by counting the parent's ancestors."""
+        depth = 0
+        while parent_id:
+            depth += 1
+            parent_id = self.filter.parent_of(parent_id)
+        return depth
+    
+    def _set_open(self, item_ids, is_open):
+        """Open or close many items with one Tcl loop instead of a call per item."""
+        live = []
+        for item_id in item_ids:
+            if item_id in self.evictor:
+                if not is_open:
+                    self.evictor.nodes[item_id][3] = False
+                    continue
+                self._ensure_live(item_id)
+            if is_open and item_id in self.evictor.subtrees:
+                self._restore_subtree(item_id)
+            live.append(item_id)
+        if live:
+            self.tree.tk.call("foreach", "item", live, f"{self.tree} item $item -open {int(is_open)}")
+    
+    def expand_to_level(self, level):
+        """Show exactly the top `level` levels, touching only the items at those depths."""
+        start = time.perf_counter()
+        count = 0
+        for depth in range(min(level - 1, len(self.depth_index))):
+            self._set_open(self.depth_index[depth], True)
+            count += len(self.depth_index[depth])
+        if 0 < level <= len(self.depth_index):
+            self._set_open(self.depth_index[level - 1], False)
+            count += len(self.depth_index[level - 1])
+        print(f"Expanded to level {level}: {count} items in {time.perf_counter() - start:.3f}s")
+    
+    def collapse_below_level(self, level):
+        """Hide everything below the top `level` levels by closing the items at that level."""
+        start = time.perf_counter()
+        if 0 < level <= len(self.depth_index):
+            items = self.depth_index[level - 1]
+            self._set_open(items, False)
+            now = time.monotonic()
+            for item_id in items:
+                if item_id not in self.evictor:
+                    self.evictor.item_collapsed(item_id, now)
+        print(f"Collapsed below level {level} in {time.perf_counter() - start:.3f}s")
+    
     def expand_all(self):
         """Expand all items in the tree."""
-        for item in self.tree.get_children():
-            self._expand_item(item)
-    
-    def _expand_item(self, item):
-        """Recursively expand an item and all its children."""
-        self.tree.item(item, open=True)
-        for child in self.tree.get_children(item):
-            self._expand_item(child)
+        self.expand_to_level(len(self.depth_index) + 1)
     
     def collapse_all(self):
         """Collapse all items in the tree."""
-        for item in self.tree.get_children():
-            self._collapse_item(item)
+        start = time.perf_counter()
+        for items in self.depth_index:
+            self._set_open(items, False)
+        now = time.monotonic()
+        for item in self.filter.children_of(""):
+            self.evictor.item_collapsed(item, now)
+        print(f"Collapsed all items in {time.perf_counter() - start:.3f}s")
+    
+    def _on_item_close(self, event):
+        """Remember when a skill was collapsed, so it can be evicted once idle."""
+        self.evictor.item_collapsed(self.tree.focus(), time.monotonic())
+    
+    def _on_item_open(self, event):
+        """Re-insert a skill's evicted subtree as it is opened."""
+        item_id = self.tree.focus()
+        self.evictor.item_opened(item_id)
+        if item_id in self.evictor.subtrees:
+            self._restore_subtree(item_id)
+    
+    def _evict_idle_subtrees(self):
+        """Evict collapsed subtrees that are idle, or the oldest while over the item cap."""
+        # Filters need every item in the Treeview
+        if not self.filter.active:
+            live = len(self.node_ids) - len(self.evictor.nodes)
+            now = time.monotonic()
+            while True:
+                item_id = self.evictor.pop_due(now, live)
+                if item_id is None:
+                    break
+                if (self.tree.exists(item_id) and not self.tree.item(item_id, "open")
+                        and item_id not in self.evictor.subtrees and self.tree.get_children(item_id)):
+                    live -= self._evict_subtree(item_id)
+        self.root.after(EVICTION_INTERVAL_MS, self._evict_idle_subtrees)
+    
+    def _evict_subtree(self, item_id):
+        """Replace an item's descendants with one placeholder, keeping their state.
+        
+        Returns the number of Treeview items removed.
+        """
+        # Structure queries must keep working without the items
+        self.filter.build()
+        
+        count = 0
+        stack = list(self.filter.children_of(item_id))
+        while stack:
+            child = stack.pop()
+            if child in self.evictor:
+                # Already evicted under a collapsed descendant
+                self.evictor.adopt(item_id, child)
+            else:
+                options = self.tree.item(child)
+                self.evictor.store(item_id, child, options["text"], options["values"][0] == "True", bool(options["open"]))
+                count += 1
+            stack.extend(self.filter.children_of(child))
+        
+        self.tree.delete(*self.tree.get_children(item_id))
+        self.tree.insert(item_id, "end", text="…")
+        self.evictor.subtrees.add(item_id)
+        return count
+    
+    def _restore_subtree(self, item_id):
+        """Re-insert an item's evicted descendants with their original item IDs."""
+        self.tree.delete(*self.tree.get_children(item_id))
+        self.evictor.subtrees.discard(item_id)
+        
+        stack = [(item_id, child) for child in reversed(self.filter.children_of(item_id))]
+        while stack:
+            parent_id, child = stack.pop()
+            _, text, completed, is_open = self.evictor.nodes.pop(child)
+            self.tree.insert(
+                parent_id,
+                "end",
+                iid=child,
+                text=text,
+                values=(str(completed),),
+                tags=self._status_tags(child, completed),
+                open=is_open
+            )
+            stack.extend((child, grandchild) for grandchild in reversed(self.filter.children_of(child)))
+    
+    def _restore_all_subtrees(self):
+        for item_id in list(self.evictor.subtrees):
+            self._restore_subtree(item_id)
+    
+    def _ensure_live(self, item_id):
+        """Re-insert the evicted subtree holding item_id, if any."""
+        owner = self.evictor.owner(item_id)
+        if owner is not None:
+            self._restore_subtree(owner)
     
-    def _collapse_item(self, item):
-        """Recursively collapse an item and all its children."""
-        for child in self.tree.get_children(item):
-            self._collapse_item(child)
-        self.tree.item(item, open=False)
+    def start_sync(self, address, host=False):
+        """Share changes with other instances through the hub at address,
+        hosting the hub in this instance if host is set."""
+        self.sync = SyncHub(address) if host else SyncClient(address)
+        self.root.after(SYNC_INTERVAL_MS, self._exchange_deltas)
+    
+    def _share(self, delta):
+        if self.sync is not None:
+            self.sync_outbox.append(delta)
+    
+    def _share_status(self, item_ids):
+        """Queue the new status of skills the user marked directly."""
+        for item_id in item_ids:
+            self._share({"op": "set", "id": self.node_ids.stable_id(item_id), "completed": self._is_completed(item_id)})
+    
+    def _exchange_deltas(self):
+        """Send the batched local deltas and apply the ones from peers."""
+        try:
+            outbox, self.sync_outbox = self.sync_outbox, []
+            self.sync.send(outbox)
+            deltas = self.sync.poll()
+            if deltas:
+                self._apply_deltas(deltas)
+        finally:
+            # Keep syncing even if one batch of deltas couldn't be applied
+            self.root.after(SYNC_INTERVAL_MS, self._exchange_deltas)
+    
+    def _apply_deltas(self, deltas):
+        """Apply peers' deltas through the usual completion rules."""
+        applied = False
+        with self.events.batch():
+            for delta in deltas:
+                if delta == "reset":
+                    messagebox.showwarning("Sync", "Too many changes were missed to catch up; reload the tree to see them.")
+                    continue
+                
+                if delta["op"] == "add":
+                    if self.node_ids.item(delta["id"]) is not None:
+                        continue
+                    parent_id = self.node_ids.item(delta["parent"]) if delta["parent"] else ""
+                    if parent_id is None:
+                        print(f"Skipping synced skill '{delta['text']}' - parent not found")
+                        continue
+                    self._ensure_live(parent_id)
+                    if parent_id in self.evictor.subtrees:
+                        self._restore_subtree(parent_id)
+                    new_item = self.tree.insert(parent_id, "end", text=delta["text"], values=("False",), tags=('not_completed',))
+                    self.node_ids.assign(new_item, parent_id, delta["text"], delta["id"])
+                    self._index_depth(new_item, self._child_depth(parent_id))
+                    self.events.emit(NODE_INSERTED, new_item)
+                    applied = True
+                
+                elif delta["op"] == "set":
+                    item_id = self.node_ids.item(delta["id"])
+                    if item_id is None:
+                        print(f"Skipping synced change to {delta['id']} - skill not found")
+                    elif self._is_completed(item_id) != delta["completed"]:
+                        self.propagation.set_many([item_id], delta["completed"])
+                        applied = True
+        
+        # Undo restores logged states without re-running the completion rules,
+        # so entries logged before a peer's change could leave parents wrong
+        if applied and (self.undo_log.can_undo() or self.undo_log.can_redo()):
+            self.undo_log.clear()
+            print("Cleared undo history after applying changes from peers")
     
     def save_tree(self):
         """Save the current skill tree to a JSON file."""
         # Ask for the file to save to
         file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=[
+                ("JSON files", "*.json"),
+                ("Compressed JSON files", "*.json.gz *.json.bz2 *.json.xz"),
+                ("All files", "*.*")
+            ],
             title="Save Skill Tree"
         )
         
         if not file_path:
             return
         
-        # Create a dictionary to store the tree structure
-        tree_data = self._serialize_tree("")
-        
         # Save to the file
         try:
-            with open(file_path, 'w') as f:
-                json.dump(tree_data, f, indent=4)
+            self.write_tree_file(file_path)
             messagebox.showinfo("Success", "Skill tree saved successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Error saving file: {str(e)}")
     
+    def write_tree_file(self, file_path):
+        """Write the current skill tree to file_path as JSON."""
+        # Create a dictionary to store the tree structure
+        tree_data = self._serialize_tree("")
+        
+        # Store prerequisites by stable ID, since item IDs don't outlive the session
+        # and paths can be shared by same-named siblings
+        if self.prerequisites.needs:
+            stable_id = self.node_ids.stable_id
+            tree_data["prerequisites"] = [
+                [stable_id(skill_id), stable_id(prerequisite_id)]
+                for skill_id, prerequisite_id in self.prerequisites.edges()
+            ]
+        
+        # Compress by extension (.json.gz/.bz2/.xz), streaming as json.dump writes
+        with open_tree_file(file_path, 'w', self.compression_level) as f:
+            json.dump(tree_data, f, indent=4)
+        
+        # The completion history is kept next to the tree, and an old one
+        # mustn't be loaded with this tree once the history is cleared
+        if len(self.history):
+            self.history.save(file_path + ".history")
+        elif os.path.exists(file_path + ".history"):
+            os.remove(file_path + ".history")
+    
+    def export_tree(self):
+        """Export the current skill tree to Markdown, HTML, OPML or Graphviz."""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".md",
+            filetypes=[
+                ("Markdown checklist", "*.md"),
+                ("HTML page", "*.html"),
+                ("OPML outline", "*.opml"),
+                ("Graphviz DOT", "*.dot"),
+                ("All files", "*.*")
+            ],
+            title="Export Skill Tree"
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            # Read straight from the Treeview, the filter's structure and evicted records
+            model = LiveTree(
+                self.filter.children_of,
+                self.filter.parent_of,
+                self._item_text,
+                self._is_completed,
+                self._is_open
+            )
+            export_tree(model, file_path, progress=True)
+            messagebox.showinfo("Success", "Skill tree exported successfully!")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error exporting file: {str(e)}")
+    
     def _serialize_tree(self, node_id):
         """Recursively serialize the tree starting from node_id."""
-        # Get all children of this node
-        children = self.tree.get_children(node_id)
+        # Get all children of this node, including any a filter is hiding
+        children = self.filter.children_of(node_id)
         
         # If this is not the root, get node data
         if node_id:
-            is_completed = self.tree.item(node_id, "values")[0] == "True"
-            node_text = self.tree.item(node_id, "text")
-            is_open = self.tree.item(node_id, "open")
+            record = self.evictor.nodes.get(node_id)
+            if record is not None:
+                _, node_text, is_completed, is_open = record
+            else:
+                is_completed = self.tree.item(node_id, "values")[0] == "True"
+                node_text = self.tree.item(node_id, "text")
+                is_open = bool(self.tree.item(node_id, "open"))
             
             # Create the node data dict
             node_data = {
+                "id": self.node_ids.stable_id(node_id),
                 "text": node_text,
                 "completed": is_completed,
                 "open": is_open,
                 "children": []
             }
+            if node_id in self.weights:
+                node_data["weight"] = self.weights[node_id]
         else:
             # Root node special case
             node_data = {"children": []}
@@ -506,7 +1109,10 @@ class SkillTreeApp:
         """Load a skill tree from a JSON file."""
         # Ask for the file to load from
         file_path = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=[
+                ("JSON files", "*.json *.json.gz *.json.bz2 *.json.xz"),
+                ("All files", "*.*")
+            ],
             title="Load Skill Tree"
         )
         
@@ -515,26 +1121,147 @@ class SkillTreeApp:
         
         # Load from the file
         try:
-            with open(file_path, 'r') as f:
-                tree_data = json.load(f)
-            
-            # Clear the current tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Load the new tree
-            self._deserialize_tree("", tree_data)
+            self.read_tree_file(file_path)
             messagebox.showinfo("Success", "Skill tree loaded successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Error loading file: {str(e)}")
     
-    def _deserialize_tree(self, parent_id, node_data):
+    def read_tree_file(self, file_path):
+        """Replace the current skill tree with the JSON tree in file_path."""
+        with open_tree_file(file_path, 'r') as f:
+            tree_data = json.load(f)
+        
+        # Load the new tree
+        self._clear_tree()
+        self._deserialize_tree("", tree_data)
+        self._load_prerequisites(file_path, tree_data.get("prerequisites", []))
+        self.events.emit(BULK_LOADED)
+        
+        if os.path.exists(file_path + ".history"):
+            self.history = CompletionHistory.load(file_path + ".history")
+            if self.history.keyed_by_path:
+                self.history.rekey({path: self.node_ids.stable_id(item_id) for path, item_id in self._item_paths().items()})
+    
+    def _clear_tree(self):
+        """Remove every skill and prerequisite from the tree."""
+        # Reattach filtered-out skills so they are deleted too
+        self.filter.reset()
+        self.filter_combo.current(0)
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        self.evictor.clear()
+        self.prerequisites.clear()
+        self.weights.clear()
+        self.history = CompletionHistory()
+        self.undo_log.clear()
+        self.node_ids.clear()
+        self.depth_index = []
+    
+    def _item_path(self, item_id):
+        """Return an item's path, its ancestors' names and its own joined by " > "."""
+        names = []
+        while item_id:
+            names.append(self._item_text(item_id))
+            item_id = self.filter.parent_of(item_id)
+        return PATH_SEPARATOR.join(reversed(names))
+    
+    def _item_paths(self, parent_id="", prefix="", paths=None):
+        """Map the path of each item (names joined by " > ") to its item ID."""
+        if paths is None:
+            paths = {}
+        for item_id in self.filter.children_of(parent_id):
+            path = prefix + self._item_text(item_id)
+            paths[path] = item_id
+            self._item_paths(item_id, path + PATH_SEPARATOR, paths)
+        return paths
+    
+    def _item_labels(self):
+        """Yield (label, item ID) in display order, where a label is an item's path
+        with repeated sibling names numbered, e.g. "Math > Practice (2)"."""
+        stack = [("", item_id) for item_id in reversed(self.filter.children_of(""))]
+        seen = {}  # (parent, name) -> times seen
+        while stack:
+            prefix, item_id = stack.pop()
+            name = self._item_text(item_id)
+            key = (self.filter.parent_of(item_id), name)
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                name = f"{name} ({seen[key]})"
+            label = prefix + name
+            yield label, item_id
+            stack.extend((label + PATH_SEPARATOR, child) for child in reversed(self.filter.children_of(item_id)))
+    
+    def _load_prerequisites(self, file_path, pairs=()):
+        """Load prerequisite edges given by stable ID, plus any given by path in the file's sidecar."""
+        # Trees saved before skills had stable IDs give paths here too
+        sidecar = prerequisite_sidecar(file_path)
+        sidecar_pairs = read_prerequisite_file(sidecar) if sidecar else []
+        if not pairs and not sidecar_pairs:
+            return
+        
+        # Resolve stable IDs and skill paths to the items that were just inserted
+        paths = None
+        def resolve(key, by_id):
+            nonlocal paths
+            item_id = self.node_ids.item(key) if by_id else None
+            if item_id is None:
+                if paths is None:
+                    paths = self._item_paths()
+                item_id = paths.get(key)
+            return item_id
+        
+        edges = []
+        for keyed_pairs, by_id in ((pairs, True), (sidecar_pairs, False)):
+            for skill_key, prerequisite_key in keyed_pairs:
+                skill_id = resolve(skill_key, by_id)
+                prerequisite_id = resolve(prerequisite_key, by_id)
+                if skill_id is not None and prerequisite_id is not None:
+                    edges.append((skill_id, prerequisite_id))
+                else:
+                    print(f"Skipping prerequisite '{prerequisite_key}' of '{skill_key}' - skill not found")
+        
+        try:
+            self.prerequisites.load_edges(edges)
+        except PrerequisiteCycleError as e:
+            messagebox.showwarning("Prerequisites", f"Prerequisites were not loaded: {str(e)}")
+            return
+        
+        # Grey out the skills that still have prerequisites to complete
+        for skill_id in self.prerequisites.needs:
+            self.tree.item(skill_id, tags=self._status_tags(skill_id, self._is_completed(skill_id)))
+    
+    def import_tree(self):
+        """Import a skill tree from OPML, a Markdown checklist or a text outline."""
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Outlines", "*.opml *.md *.markdown *.txt"),
+                ("All files", "*.*")
+            ],
+            title="Import Skill Tree"
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            model = SkillModel.from_file(file_path)
+            
+            # Load the imported tree
+            self._clear_tree()
+            self._deserialize_tree("", model.to_json())
+            self._load_prerequisites(file_path)
+            self.events.emit(BULK_LOADED)
+            messagebox.showinfo("Success", "Skill tree imported successfully!")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error importing file: {str(e)}")
+    
+    def _deserialize_tree(self, parent_id, node_data, depth=0):
         """Recursively build the tree from the serialized data."""
         # Handle root node special case
         if "text" not in node_data:
             # This is the root node special case
             for child_data in node_data["children"]:
-                self._deserialize_tree(parent_id, child_data)
+                self._deserialize_tree(parent_id, child_data, depth)
             return
         
         # Regular node case
@@ -549,17 +1276,29 @@ class SkillTreeApp:
             values=(str(completed),),
             tags=(tag,)
         )
+        self.node_ids.assign(new_id, parent_id, node_data["text"], node_data.get("id"))
+        self._index_depth(new_id, depth)
         
         # Set open state
         is_open = node_data.get("open", True)
         self.tree.item(new_id, open=is_open)
         
+        # Keep the user's weight for ranking what to study next
+        if "weight" in node_data:
+            self.weights[new_id] = node_data["weight"]
+        
         # Process all children
         for child_data in node_data.get("children", []):
-            self._deserialize_tree(new_id, child_data)
+            self._deserialize_tree(new_id, child_data, depth + 1)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Nested Skill Tree")
+    sync_group = parser.add_mutually_exclusive_group()
+    sync_group.add_argument("--serve", metavar="ADDRESS", help="host a sync hub at host:port or a Unix socket path")
+    sync_group.add_argument("--connect", metavar="ADDRESS", help="sync with the hub at host:port or a Unix socket path")
+    args = parser.parse_args()
+    
     root = tk.Tk()
     
     # Set default font for the application - using more beautiful fonts
@@ -592,6 +1331,9 @@ def main():
         if isinstance(widget, ttk.Label) and widget.cget("text") == "Nested Skill Tree":
             widget.configure(font=title_font)
     
+    if args.serve or args.connect:
+        app.start_sync(args.serve or args.connect, host=bool(args.serve))
+    
     root.mainloop()
 
 
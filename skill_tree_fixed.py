@@ -10,6 +10,9 @@ import json
 import os
 from tkinter import filedialog, messagebox
 
+from propagation import PropagationEngine
+from undo import UndoLog
+
 
 class SkillTreeApp:
     def __init__(self, root):
@@ -34,7 +37,8 @@ class SkillTreeApp:
             "• Double-click on a skill to mark it as completed/incomplete\n"
             "• Click on the arrows to expand/collapse subtrees\n"
             "• Completing a parent skill completes all child skills\n"
-            "• A parent is automatically completed when all children are completed"
+            "• A parent is automatically completed when all children are completed\n"
+            "• Ctrl+Z undoes the last change, Ctrl+Y redoes it"
         )
         instructions_label = ttk.Label(
             self.title_frame,
@@ -125,11 +129,28 @@ class SkillTreeApp:
         )
         load_button.pack(side=tk.RIGHT, padx=5)
         
+        # Marking a parent cascades to its subtree, parents follow their children
+        self.propagation = PropagationEngine(
+            self.tree.get_children,
+            lambda item_id: self.tree.parent(item_id) or None,
+            self._is_completed,
+            self._set_status,
+            policy="cascade"
+        )
+        
+        # Completion changes that can be undone, at most 200 actions back
+        self.undo_log = UndoLog(self._set_status, depth=200)
+        
         # Initialize the skill tree
         self.populate_tree()
         
         # Bind the completion toggle action to double-click
         self.tree.bind("<Double-1>", self.toggle_completion)
+        
+        # Bind undo and redo
+        self.root.bind("<Control-z>", lambda event: self.undo_log.undo())
+        self.root.bind("<Control-y>", lambda event: self.undo_log.redo())
+        self.root.bind("<Control-Z>", lambda event: self.undo_log.redo())
     
     def populate_tree(self):
         """Populate the tree with the skill tree structure from math.txt."""
@@ -243,78 +264,22 @@ class SkillTreeApp:
         if not item_id:
             return
             
-        # Get the current completion status
-        current_values = self.tree.item(item_id, "values")
-        if len(current_values) < 1:
-            return
-            
-        current_status = str(current_values[0])
-        
-        # Toggle the status
-        if current_status == "True":
-            new_status = False
-            display_value = "❌"
-            self.tree.item(item_id, tags=('not_completed',))
-        else:
-            new_status = True
-            display_value = "✅"
-            self.tree.item(item_id, tags=('completed',))
-            
-        # Update the item
-        self.tree.item(item_id, values=(str(new_status), display_value))
+        # Toggle the status; the whole subtree follows, then the ancestors
+        changed = self.propagation.toggle(item_id)
+        self.undo_log.record(changed, [not self._is_completed(skill_id) for skill_id in changed])
         
         # Add debugging message
-        print(f"Toggled item: {self.tree.item(item_id, 'text')}, new status: {new_status}")
-        
-        # Update all children if this is a parent node
-        self.update_children(item_id, new_status)
-        
-        # Check parent status
-        self.update_parent(self.tree.parent(item_id))
+        print(f"Toggled item: {self.tree.item(item_id, 'text')}, new status: {self._is_completed(item_id)}")
     
-    def update_children(self, parent_id, status):
-        """Update all children to match parent's completion status."""
-        display_value = "✅" if status else "❌"
-        status_str = str(status)
-        for child_id in self.tree.get_children(parent_id):
-            if status:
-                self.tree.item(child_id, tags=('completed',))
-            else:
-                self.tree.item(child_id, tags=('not_completed',))
-                
-            self.tree.item(child_id, values=(status_str, display_value))
-            # Recursively update all descendants
-            self.update_children(child_id, status)
+    def _is_completed(self, item_id):
+        """Check whether an item is marked as completed."""
+        return self.tree.item(item_id, "values")[0] == "True"
     
-    def update_parent(self, parent_id):
-        """Update parent status based on children's statuses."""
-        if not parent_id:
-            return
-            
-        # Check if all children are completed
-        children = self.tree.get_children(parent_id)
-        if not children:
-            return
-            
-        all_completed = True
-        for child_id in children:
-            child_status = str(self.tree.item(child_id, "values")[0])
-            if child_status != "True":
-                all_completed = False
-                break
-                
-        # Update parent status
-        display_value = "✅" if all_completed else "❌"
-        self.tree.item(parent_id, values=(str(all_completed), display_value))
-        
-        # Update the tag
-        if all_completed:
-            self.tree.item(parent_id, tags=('completed',))
-        else:
-            self.tree.item(parent_id, tags=('not_completed',))
-            
-        # Recursively update ancestors
-        self.update_parent(self.tree.parent(parent_id))
+    def _set_status(self, item_id, status):
+        """Set an item's completion status, display mark and tag."""
+        display_value = "✅" if status else "❌"
+        tag = 'completed' if status else 'not_completed'
+        self.tree.item(item_id, values=(str(status), display_value), tags=(tag,))
     
     def add_skill_dialog(self):
         """Open a dialog to add a new skill."""
@@ -487,6 +452,7 @@ class SkillTreeApp:
             # Clear the current tree
             for item in self.tree.get_children():
                 self.tree.delete(item)
+            self.undo_log.clear()
             
             # Load the new tree
             self._deserialize_tree("", tree_data)
@@ -0,0 +1,312 @@
+"""
+Peer Sync
+Shares completion and add-skill deltas between running instances over a
+local TCP or Unix socket. One instance hosts a hub that numbers every
+delta and keeps a log of them; the others connect as clients. A client
+that reconnects catches up from the log instead of reloading the tree.
+
+Messages are JSON objects, one per line:
+    {"type": "hello", "peer": ..., "epoch": hub epoch last seen or null,
+     "since": last hub sequence number seen}
+    {"type": "welcome", "epoch": ..., "deltas": [...]}  - what the client missed
+    {"type": "deltas", "deltas": [...]}
+    {"type": "reset", "epoch": ..., "seq": ...}  - the log can't catch the client
+        up; it should reload the tree and continue from seq
+Every hub start picks a new epoch, so sequence numbers from an earlier run
+of the hub are never mistaken for ones from this run.
+Each delta is {"op": "set", "id": stable ID, "completed": bool} or
+{"op": "add", "id": stable ID, "parent": parent's stable ID or "", "text": name},
+plus "origin", "local" (the origin's own counter) and, once the hub has
+logged it, "seq".
+"""
+import argparse
+from collections import deque
+import json
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+
+
+# Seconds between reconnection attempts
+RECONNECT_DELAY = 1.0
+
+
+def parse_address(address):
+    """Return (family, address) for "host:port" or a Unix socket path."""
+    if "/" in address or ":" not in address:
+        return socket.AF_UNIX, address
+    host, port = address.rsplit(":", 1)
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def _shutdown(sock):
+    """Close a socket even while a makefile() reader still holds it open."""
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass  # Not connected, or already shut down
+    sock.close()
+
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message, separators=(",", ":")).encode('utf-8') + b"\n")
+
+
+class DeltaLog:
+    """The hub's numbered deltas, keeping at most max_entries of the newest."""
+
+    def __init__(self, max_entries=100000):
+        self.entries = deque(maxlen=max_entries)
+        self.last_seq = 0
+
+    def append(self, delta):
+        self.last_seq += 1
+        delta["seq"] = self.last_seq
+        self.entries.append(delta)
+        return delta
+
+    def since(self, seq):
+        """Return the deltas after seq, or None if the log can't bring seq up to date."""
+        first = self.last_seq - len(self.entries) + 1
+        # Too old, or from before this hub was restarted
+        if seq + 1 < first or seq > self.last_seq:
+            return None
+        return list(self.entries)[max(0, seq + 1 - first):]
+
+
+class SyncPeer:
+    """Shared parts of the hub and the client: the outbox and inbox."""
+
+    def __init__(self, peer_id=None):
+        self.peer_id = peer_id or uuid.uuid4().hex
+        self.inbox = queue.Queue()  # Remote deltas in sequence order, or "reset"
+        self.next_local = 1
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def _stamp(self, delta):
+        delta["origin"] = self.peer_id
+        delta["local"] = self.next_local
+        self.next_local += 1
+        return delta
+
+    def poll(self):
+        """Return the remote deltas received since the last call (call from the UI thread)."""
+        deltas = []
+        while True:
+            try:
+                deltas.append(self.inbox.get_nowait())
+            except queue.Empty:
+                return deltas
+
+
+class SyncHub(SyncPeer):
+    def __init__(self, address, peer_id=None, max_log_entries=100000):
+        super().__init__(peer_id)
+        self.log = DeltaLog(max_log_entries)
+        self.epoch = uuid.uuid4().hex
+        self.high_water = {}  # Origin -> last "local" counter logged from it
+        self.sockets = set()   # Every accepted socket, so close() can end them all
+        self.connections = []  # Sockets that have been welcomed and get broadcasts
+        # Held while sending, so every client gets messages in sequence order,
+        # without holding self.lock while a slow client takes them
+        self.send_lock = threading.Lock()
+
+        family, addr = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(addr):
+            os.unlink(addr)
+        self.server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(addr)
+        self.server.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while not self.closed:
+            try:
+                sock, _ = self.server.accept()
+            except OSError:
+                return
+            with self.lock:
+                if self.closed:
+                    _shutdown(sock)
+                    return
+                self.sockets.add(sock)
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        try:
+            with sock, sock.makefile('rb') as reader:
+                for line in reader:
+                    message = json.loads(line)
+                    if message["type"] == "hello":
+                        self._welcome(sock, message.get("epoch"), message["since"])
+                    elif message["type"] == "deltas":
+                        self._publish(message["deltas"])
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self.lock:
+                self.sockets.discard(sock)
+                if sock in self.connections:
+                    self.connections.remove(sock)
+
+    def _welcome(self, sock, epoch, since):
+        """Send a (re)connecting client what it missed, then start broadcasting to it."""
+        with self.send_lock:
+            with self.lock:
+                if self.closed:
+                    raise OSError("Hub is closed")
+                # Sequence numbers from another run of the hub mean nothing here
+                missed = self.log.since(since) if epoch in (None, self.epoch) else None
+                self.connections.append(sock)
+            if missed is None:
+                _send(sock, {"type": "reset", "epoch": self.epoch, "seq": self.log.last_seq})
+            else:
+                _send(sock, {"type": "welcome", "epoch": self.epoch, "deltas": missed})
+
+    def _publish(self, deltas):
+        """Number new deltas, log them and broadcast them as one batch."""
+        with self.send_lock:
+            with self.lock:
+                logged = []
+                for delta in deltas:
+                    # Skip deltas a reconnecting client sent again
+                    if delta["local"] <= self.high_water.get(delta["origin"], 0):
+                        continue
+                    self.high_water[delta["origin"]] = delta["local"]
+                    logged.append(self.log.append(delta))
+                if not logged:
+                    return
+                connections = list(self.connections)
+
+            message = {"type": "deltas", "deltas": logged}
+            for sock in connections:
+                try:
+                    _send(sock, message)
+                except OSError:
+                    # Its _serve thread forgets it once the socket is shut down
+                    _shutdown(sock)
+
+        for delta in logged:
+            if delta["origin"] != self.peer_id:
+                self.inbox.put(delta)
+
+    def send(self, deltas):
+        """Share local deltas with every client."""
+        if deltas:
+            self._publish([self._stamp(delta) for delta in deltas])
+
+    def close(self):
+        self.closed = True
+        _shutdown(self.server)
+        with self.lock:
+            for sock in self.sockets:
+                _shutdown(sock)
+            self.sockets.clear()
+            self.connections.clear()
+
+
+class SyncClient(SyncPeer):
+    def __init__(self, address, peer_id=None):
+        super().__init__(peer_id)
+        self.address = address
+        self.epoch = None        # Epoch of the hub last_seq came from
+        self.last_seq = 0        # Last hub sequence number applied
+        self.unacked = deque()   # Own deltas not yet seen back from the hub
+        self.sock = None
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        """Keep a connection to the hub, catching up after every reconnect."""
+        family, addr = parse_address(self.address)
+        while not self.closed:
+            try:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.connect(addr)
+            except OSError:
+                sock.close()
+                time.sleep(RECONNECT_DELAY)
+                continue
+
+            try:
+                with self.lock:
+                    self.sock = sock
+                    _send(sock, {"type": "hello", "peer": self.peer_id, "epoch": self.epoch, "since": self.last_seq})
+                    # Resend what the hub may not have logged; it drops duplicates
+                    if self.unacked:
+                        _send(sock, {"type": "deltas", "deltas": list(self.unacked)})
+
+                with sock.makefile('rb') as reader:
+                    for line in reader:
+                        self._receive(json.loads(line))
+            except (OSError, ValueError):
+                pass
+            with self.lock:
+                self.sock = None
+            sock.close()
+            time.sleep(RECONNECT_DELAY)
+
+    def _receive(self, message):
+        if message["type"] == "reset":
+            self.epoch = message["epoch"]
+            self.last_seq = message["seq"]
+            self.inbox.put("reset")
+            return
+        if message["type"] == "welcome":
+            self.epoch = message["epoch"]
+        for delta in message["deltas"]:
+            if delta["seq"] <= self.last_seq:
+                continue
+            self.last_seq = delta["seq"]
+            if delta["origin"] == self.peer_id:
+                # The hub has logged our own delta
+                with self.lock:
+                    while self.unacked and self.unacked[0]["local"] <= delta["local"]:
+                        self.unacked.popleft()
+            else:
+                self.inbox.put(delta)
+
+    def send(self, deltas):
+        """Send local deltas to the hub in one batch, or hold them until reconnected."""
+        if not deltas:
+            return
+        deltas = [self._stamp(delta) for delta in deltas]
+        with self.lock:
+            self.unacked.extend(deltas)
+            if self.sock is not None:
+                try:
+                    _send(self.sock, {"type": "deltas", "deltas": deltas})
+                except OSError:
+                    pass  # Resent after reconnecting
+
+    def close(self):
+        self.closed = True
+        with self.lock:
+            if self.sock is not None:
+                _shutdown(self.sock)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a sync hub, or watch the deltas passing through one.")
+    parser.add_argument("mode", choices=("serve", "watch"))
+    parser.add_argument("address", help="host:port or Unix socket path")
+    args = parser.parse_args()
+
+    peer = SyncHub(args.address) if args.mode == "serve" else SyncClient(args.address)
+    print(f"{args.mode} {args.address} as {peer.peer_id}")
+    try:
+        while True:
+            for delta in peer.poll():
+                print(json.dumps(delta))
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        peer.close()
+
+
+if __name__ == "__main__":
+    main()
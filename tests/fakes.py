@@ -0,0 +1,121 @@
+"""
+Test Stand-ins
+A dictionary-backed stand-in for ttk.Treeview and the few other widgets
+the app touches, so tree logic can be tested without a display.
+"""
+
+
+class FakeTk:
+    """Runs the one Tcl loop the app uses: foreach item $items {$tree item $item -open N}."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def call(self, command, variable, items, script):
+        is_open = int(script.split()[-1])
+        for item in items:
+            if item not in self.tree.data:
+                raise RuntimeError(f'Item {item} not found')
+            self.tree.data[item]["open"] = is_open
+
+
+class FakeTree:
+    def __init__(self):
+        self.kids = {"": []}
+        self.par = {}
+        self.data = {}
+        self.count = 0
+        self.tk = FakeTk(self)
+
+    def __str__(self):
+        return ".tree"
+
+    def insert(self, parent, index, iid=None, text="", values=(), tags=(), open=False):
+        if iid is None:
+            self.count += 1
+            iid = f"I{self.count:03X}"
+        self.kids[iid] = []
+        self.par[iid] = parent
+        self.kids[parent].append(iid)
+        self.data[iid] = {"text": text, "values": list(values), "tags": tags, "open": int(bool(open))}
+        return iid
+
+    def get_children(self, item=""):
+        return tuple(self.kids[item])
+
+    def parent(self, item):
+        return self.par[item]
+
+    def exists(self, item):
+        return item in self.data
+
+    def delete(self, *items):
+        for item in items:
+            for child in list(self.kids[item]):
+                self.delete(child)
+            self.kids[self.par[item]].remove(item)
+            del self.kids[item], self.par[item], self.data[item]
+
+    def set_children(self, item, *children):
+        # Like Tk, detached items lose their parent
+        for child in self.kids[item]:
+            if child not in children:
+                self.par[child] = ""
+        for child in children:
+            self.par[child] = item
+        self.kids[item] = list(children)
+
+    def item(self, item, option=None, **kwargs):
+        if kwargs:
+            for key, value in kwargs.items():
+                self.data[item][key] = list(value) if key == "values" else value
+            return None
+        if option:
+            return self.data[item][option]
+        return dict(self.data[item])
+
+
+class OrderedSet(set):
+    """A set that iterates in a chosen order, to pin down batch ordering."""
+
+    def __init__(self, items):
+        super().__init__(items)
+        self.order = list(items)
+
+    def __iter__(self):
+        return iter(self.order)
+
+
+class FakeWidget:
+    """Accepts any method call, for widgets whose display doesn't matter here."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class FakeRoot(FakeWidget):
+    """Queues after() callbacks until run_pending is called."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, func=None, *args):
+        self.pending.append((func, args))
+
+    def run_pending(self):
+        pending, self.pending = self.pending, []
+        for func, args in pending:
+            func(*args)
+
+
+def make_app():
+    """Return a SkillTreeApp with an empty FakeTree and no real widgets."""
+    from skill_tree import SkillTreeApp
+
+    app = SkillTreeApp.__new__(SkillTreeApp)
+    app.root = FakeRoot()
+    app.tree = FakeTree()
+    for name in ("filter_combo", "next_up_list", "ranking_combo", "policy_combo", "search_entry", "instructions"):
+        setattr(app, name, FakeWidget())
+    app._create_state()
+    return app
@@ -0,0 +1,156 @@
+"""
+Original Completion Rules
+The toggle/update_children/update_parent methods as the two apps shipped
+them before propagation.py, kept as a fixture to check the engine against.
+Only the click lookup and the debugging prints are left out.
+"""
+
+
+class OriginalLeafOnly:
+    """skill_tree.py: only bottom-level skills toggle; parents follow their children."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def toggle_completion(self, item_id):
+        """Toggle the completion status of a skill."""
+        # Check if this item has children
+        children = self.tree.get_children(item_id)
+        if children:
+            return
+            
+        # Get the current completion status
+        current_values = self.tree.item(item_id, "values")
+        if len(current_values) < 1:
+            return
+            
+        current_status = str(current_values[0])
+        
+        # Toggle the status
+        if current_status == "True":
+            new_status = False
+            self.tree.item(item_id, tags=('not_completed',))
+        else:
+            new_status = True
+            self.tree.item(item_id, tags=('completed',))
+            
+        # Update the item (only store the status, no display character)
+        self.tree.item(item_id, values=(str(new_status),))
+        
+        # Check parent status
+        parent_id = self.tree.parent(item_id)
+        if parent_id:
+            self.update_parent(parent_id)
+    
+    def update_parent(self, parent_id):
+        """Update parent status based on children's statuses."""
+        if not parent_id:
+            return
+            
+        # Check if all children are completed
+        children = self.tree.get_children(parent_id)
+        if not children:
+            return
+            
+        all_completed = True
+        for child_id in children:
+            child_values = self.tree.item(child_id, "values")
+            if len(child_values) < 1:
+                all_completed = False
+                break
+                
+            child_status = str(child_values[0])
+            if child_status != "True":
+                all_completed = False
+                break
+                
+        # Update parent status
+        self.tree.item(parent_id, values=(str(all_completed),))
+        
+        # Update the tag
+        if all_completed:
+            self.tree.item(parent_id, tags=('completed',))
+        else:
+            self.tree.item(parent_id, tags=('not_completed',))
+            
+        # Recursively update ancestors
+        self.update_parent(self.tree.parent(parent_id))
+
+
+class OriginalCascade:
+    """skill_tree_fixed.py: any skill toggles, its subtree follows, then its ancestors."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def toggle_completion(self, item_id):
+        """Toggle the completion status of a skill."""
+        # Get the current completion status
+        current_values = self.tree.item(item_id, "values")
+        if len(current_values) < 1:
+            return
+            
+        current_status = str(current_values[0])
+        
+        # Toggle the status
+        if current_status == "True":
+            new_status = False
+            display_value = "❌"
+            self.tree.item(item_id, tags=('not_completed',))
+        else:
+            new_status = True
+            display_value = "✅"
+            self.tree.item(item_id, tags=('completed',))
+            
+        # Update the item
+        self.tree.item(item_id, values=(str(new_status), display_value))
+        
+        # Update all children if this is a parent node
+        self.update_children(item_id, new_status)
+        
+        # Check parent status
+        self.update_parent(self.tree.parent(item_id))
+    
+    def update_children(self, parent_id, status):
+        """Update all children to match parent's completion status."""
+        display_value = "✅" if status else "❌"
+        status_str = str(status)
+        for child_id in self.tree.get_children(parent_id):
+            if status:
+                self.tree.item(child_id, tags=('completed',))
+            else:
+                self.tree.item(child_id, tags=('not_completed',))
+                
+            self.tree.item(child_id, values=(status_str, display_value))
+            # Recursively update all descendants
+            self.update_children(child_id, status)
+    
+    def update_parent(self, parent_id):
+        """Update parent status based on children's statuses."""
+        if not parent_id:
+            return
+            
+        # Check if all children are completed
+        children = self.tree.get_children(parent_id)
+        if not children:
+            return
+            
+        all_completed = True
+        for child_id in children:
+            child_status = str(self.tree.item(child_id, "values")[0])
+            if child_status != "True":
+                all_completed = False
+                break
+                
+        # Update parent status
+        display_value = "✅" if all_completed else "❌"
+        self.tree.item(parent_id, values=(str(all_completed), display_value))
+        
+        # Update the tag
+        if all_completed:
+            self.tree.item(parent_id, tags=('completed',))
+        else:
+            self.tree.item(parent_id, tags=('not_completed',))
+            
+        # Recursively update ancestors
+        self.update_parent(self.tree.parent(parent_id))
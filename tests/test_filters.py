@@ -0,0 +1,69 @@
+import unittest
+
+from events import ChangeBatch
+from filters import TreeFilter
+from tests.fakes import FakeTree, OrderedSet
+
+
+class TreeFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.tree = FakeTree()
+        self.completed = set()
+        self.filter = TreeFilter(self.tree, lambda item: item in self.completed)
+
+        math = self.tree.insert("", "end", text="Math")
+        self.leaves = [self.tree.insert(math, "end", text=f"Skill {i}") for i in range(3)]
+        self.filter.build()
+
+    def assert_counts_match_rebuild(self):
+        fresh = TreeFilter(self.tree, self.filter.is_completed)
+        fresh.build()
+        self.assertEqual(self.filter.incomplete_leaves, fresh.incomplete_leaves)
+
+    def test_child_inserted_before_parent_in_batch(self):
+        parent = self.tree.insert(self.leaves[0], "end", text="Parent")
+        child = self.tree.insert(parent, "end", text="Child")
+
+        batch = ChangeBatch()
+        batch.inserted = OrderedSet([child, parent])
+        self.filter.on_tree_changed(batch)
+
+        self.assertEqual(self.filter.children_of(parent), (child,))
+        self.assertEqual(self.filter.parent_of(child), parent)
+        self.assert_counts_match_rebuild()
+
+    def test_leaf_flipped_twice_in_batch(self):
+        leaf = self.leaves[1]
+        self.completed.add(leaf)
+        self.completed.discard(leaf)
+
+        batch = ChangeBatch()
+        batch.changed.add(leaf)
+        self.filter.on_tree_changed(batch)
+        self.assert_counts_match_rebuild()
+
+        self.completed.add(leaf)
+        self.filter.on_tree_changed(batch)
+        self.assert_counts_match_rebuild()
+        self.filter.on_tree_changed(batch)
+        self.assert_counts_match_rebuild()
+
+    def test_insert_under_completed_leaf(self):
+        leaf = self.leaves[2]
+        self.completed.add(leaf)
+        batch = ChangeBatch()
+        batch.changed.add(leaf)
+        self.filter.on_tree_changed(batch)
+
+        # Adding a skill makes the leaf a parent, and propagation un-completes it
+        child = self.tree.insert(leaf, "end", text="New")
+        self.completed.discard(leaf)
+        batch = ChangeBatch()
+        batch.inserted.add(child)
+        batch.changed.add(leaf)
+        self.filter.on_tree_changed(batch)
+        self.assert_counts_match_rebuild()
+
+
+if __name__ == "__main__":
+    unittest.main()
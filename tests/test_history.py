@@ -0,0 +1,66 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from history import HEADER, PATH_HISTORY_MAGIC, CompletionHistory
+from tests.fakes import make_app
+
+
+class CompletionHistoryTest(unittest.TestCase):
+    def test_subtree_activity_counts_only_given_skills(self):
+        history = CompletionHistory()
+        history.record("a", True, timestamp=10)
+        history.record("b", True, timestamp=20)
+        history.record("a", False, timestamp=30)
+        history.record("c", True, timestamp=40)
+
+        self.assertEqual(history.subtree_activity(["a", "b", "missing"], 0, 40, 20), [(0, 1, 0), (20, 1, 1)])
+        self.assertEqual(history.completed_between(0, 50), ["b", "c"])
+
+
+class AppHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "tree.json")
+        self.app = make_app()
+        self.app._deserialize_tree("", {"children": [
+            {"text": "Math", "children": [{"text": "Practice"}, {"text": "Practice"}]}
+        ]})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_same_named_siblings_keep_their_own_history(self):
+        math = self.app.tree.get_children()[0]
+        first, second = self.app.tree.get_children(math)
+        self.app._set_status(first, True)
+
+        keys = list(self.app._subtree_keys(math))
+        self.assertEqual(self.app.history.completed_between(0, float("inf")), [self.app.node_ids.stable_id(first)])
+        self.assertEqual(self.app.history.subtree_activity([self.app.node_ids.stable_id(second)], 0, 1e10, 1e10), [(0, 0, 0)])
+        self.assertEqual(self.app.history.subtree_activity(keys, 0, 1e10, 1e10), [(0, 1, 0)])
+
+    def test_saving_without_history_removes_the_old_file(self):
+        self.app._set_status(self.app.tree.get_children()[0], True)
+        self.app.write_tree_file(self.file_path)
+        self.assertTrue(os.path.exists(self.file_path + ".history"))
+
+        self.app.history = CompletionHistory()
+        self.app.write_tree_file(self.file_path)
+        self.assertFalse(os.path.exists(self.file_path + ".history"))
+
+    def test_path_keyed_file_is_converted_on_load(self):
+        self.app.write_tree_file(self.file_path)
+        table = b'["Math"]'
+        with open(self.file_path + ".history", 'wb') as f:
+            f.write(HEADER.pack(PATH_HISTORY_MAGIC, 1, 1, len(table)) + table)
+            f.write(struct.pack("<d", 100.0) + struct.pack("<i", 0) + struct.pack("<b", 1))
+
+        self.app.read_tree_file(self.file_path)
+        math = self.app.tree.get_children()[0]
+        self.assertEqual(self.app.history.completed_between(0, 200), [self.app.node_ids.stable_id(math)])
+
+
+if __name__ == '__main__':
+    unittest.main()
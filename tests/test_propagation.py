@@ -0,0 +1,129 @@
+import copy
+import math
+import random
+import unittest
+
+from propagation import PropagationEngine
+from tests.fakes import FakeTree
+from tests.original_rules import OriginalCascade, OriginalLeafOnly
+
+TREES = 200
+TOGGLES = 50
+
+
+def random_tree(rng):
+    """Return a FakeTree of up to 200 skills with random statuses, and its items."""
+    tree = FakeTree()
+    items = []
+    for index in range(rng.randrange(1, 200)):
+        parent = rng.choice(items) if items and rng.random() < 0.9 else ""
+        items.append(tree.insert(parent, "end", text=f"Skill {index}", values=(str(rng.random() < 0.4),)))
+    return tree, items
+
+
+def engine_for(tree, policy, threshold=0.8):
+    def set_completed(item_id, status):
+        tree.item(item_id, values=(str(status),))
+
+    return PropagationEngine(
+        tree.get_children,
+        lambda item_id: tree.parent(item_id) or None,
+        lambda item_id: tree.item(item_id, "values")[0] == "True",
+        set_completed,
+        policy,
+        threshold
+    )
+
+
+def statuses(tree, items):
+    return [tree.item(item_id, "values")[0] == "True" for item_id in items]
+
+
+def settle(engine, tree, items):
+    """Make every parent agree with the policy's rule, deepest first."""
+    for item_id in reversed(items):
+        if tree.get_children(item_id):
+            engine._set(item_id, engine._parent_status(item_id), [])
+
+
+class OriginalRulesTest(unittest.TestCase):
+    """The engine must do exactly what the apps' own methods did."""
+
+    def check_against(self, original_class, policy):
+        rng = random.Random(policy)
+        for _ in range(TREES):
+            tree, items = random_tree(rng)
+            reference = copy.deepcopy(tree)
+            engine = engine_for(tree, policy)
+            original = original_class(reference)
+
+            for _ in range(TOGGLES):
+                item_id = rng.choice(items)
+                engine.toggle(item_id)
+                original.toggle_completion(item_id)
+                self.assertEqual(statuses(tree, items), statuses(reference, items))
+
+    def test_leaf_only_matches_skill_tree(self):
+        self.check_against(OriginalLeafOnly, "leaf-only")
+
+    def test_cascade_matches_skill_tree_fixed(self):
+        self.check_against(OriginalCascade, "cascade")
+
+
+class PolicyPropertiesTest(unittest.TestCase):
+    """Policies without an original are checked against the rule they state."""
+
+    def test_threshold_parents_follow_the_threshold(self):
+        rng = random.Random("threshold")
+        for _ in range(TREES):
+            tree, items = random_tree(rng)
+            threshold = rng.choice((0.3, 0.5, 0.8, 1.0))
+            engine = engine_for(tree, "threshold", threshold)
+            settle(engine, tree, items)
+
+            for _ in range(TOGGLES):
+                engine.toggle(rng.choice(items))
+                for item_id in items:
+                    children = tree.get_children(item_id)
+                    if children:
+                        done = sum(statuses(tree, children))
+                        expected = done >= math.ceil(threshold * len(children))
+                        self.assertEqual(statuses(tree, [item_id])[0], expected)
+
+    def test_manual_changes_only_the_toggled_skill(self):
+        rng = random.Random("manual")
+        for _ in range(TREES):
+            tree, items = random_tree(rng)
+            engine = engine_for(tree, "manual")
+            for _ in range(TOGGLES):
+                item_id = rng.choice(items)
+                before = statuses(tree, items)
+                self.assertEqual(engine.toggle(item_id), [item_id])
+                after = statuses(tree, items)
+                changed = [item for item, old, new in zip(items, before, after) if old != new]
+                self.assertEqual(changed, [item_id])
+
+    def test_set_many_matches_toggling_one_at_a_time(self):
+        rng = random.Random("set_many")
+        for policy in ("leaf-only", "cascade", "threshold"):
+            for _ in range(TREES):
+                tree, items = random_tree(rng)
+                engine = engine_for(tree, policy)
+                settle(engine, tree, items)
+                reference = copy.deepcopy(tree)
+                one_by_one = engine_for(reference, policy)
+
+                status = rng.random() < 0.5
+                chosen = rng.sample(items, rng.randrange(1, len(items) + 1))
+                # Cascades overlap, so compare on skills that don't contain each other
+                if policy == "cascade":
+                    chosen = [item for item in chosen if not tree.get_children(item)]
+                engine.set_many(chosen, status)
+                for item_id in chosen:
+                    if one_by_one.can_toggle(item_id) and one_by_one.is_completed(item_id) != status:
+                        one_by_one.toggle(item_id)
+                self.assertEqual(statuses(tree, items), statuses(reference, items), policy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from recommend import NextUpQueue
+
+
+def random_leaves(rng, count):
+    """Return the index paths of the bottom-level skills in a random tree."""
+    paths = set()
+    for _ in range(count):
+        paths.add(tuple(rng.randrange(4) for _ in range(rng.randrange(1, 5))))
+    return sorted(path for path in paths if not any(other[:len(path)] == path for other in paths if other != path))
+
+
+class NextUpQueueTest(unittest.TestCase):
+    def test_rankings_match_a_full_sort(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            leaves = random_leaves(rng, rng.randrange(1, 60))
+            weights = {leaf: rng.randrange(5) for leaf in leaves}
+            parent_of = lambda leaf: leaf[:-1]
+            queue = NextUpQueue(parent_of, lambda leaf: leaf, weights.get)
+
+            queued = set(rng.sample(leaves, len(leaves) // 2))
+            queue.add_many(queued)
+            for _ in range(40):
+                leaf = rng.choice(leaves)
+                if leaf in queued:
+                    queue.discard(leaf)
+                    queued.discard(leaf)
+                else:
+                    queue.add(leaf)
+                    queued.add(leaf)
+
+                for ranking in NextUpQueue.RANKINGS:
+                    queue.set_ranking(ranking)
+                    # Branches rank by queued skills left, then by their first one
+                    remaining, first = {}, {}
+                    for item in sorted(queued):
+                        remaining[parent_of(item)] = remaining.get(parent_of(item), 0) + 1
+                        first.setdefault(parent_of(item), item)
+                    key = {
+                        "Tree order": lambda item: item,
+                        "Shallowest first": lambda item: (len(item), item),
+                        "Finish a branch": lambda item: (remaining[parent_of(item)], first[parent_of(item)], item),
+                        "Highest weight": lambda item: (-weights[item], item),
+                    }[ranking]
+                    self.assertEqual(queue.first(15), sorted(queued, key=key)[:15], ranking)
+
+
+if __name__ == "__main__":
+    unittest.main()
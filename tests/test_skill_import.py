@@ -0,0 +1,47 @@
+import io
+import unittest
+
+from skill_import import ImportFormatError, build_tree, read_opml
+from skill_model import SkillModel
+
+OPML = b"""<?xml version="1.0"?>
+<opml version="2.0">
+  <head><title>Skills</title></head>
+  <body>
+    <outline text="Math">
+      <outline text="Algebra" completed="true"/>
+      <outline title="Geometry"/>
+    </outline>
+    <outline text="Physics"/>
+  </body>
+</opml>
+"""
+
+
+class ReadOpmlTest(unittest.TestCase):
+    def test_records_carry_line_numbers(self):
+        records = list(read_opml(io.BytesIO(OPML)))
+        self.assertEqual(records, [
+            (5, 0, "Math", False),
+            (6, 1, "Algebra", True),
+            (7, 1, "Geometry", False),
+            (9, 0, "Physics", False)
+        ])
+        model = build_tree(iter(records), SkillModel())
+        self.assertEqual(model.text, ["Math", "Algebra", "Geometry", "Physics"])
+
+    def test_outline_without_text_reports_its_line(self):
+        broken = OPML.replace(b'title="Geometry"', b'note="Geometry"')
+        with self.assertRaises(ImportFormatError) as caught:
+            list(read_opml(io.BytesIO(broken)))
+        self.assertEqual(caught.exception.line, 7)
+
+    def test_malformed_xml_reports_its_line(self):
+        broken = OPML.replace(b"</outline>\n    <outline", b"</outlin>\n    <outline")
+        with self.assertRaises(ImportFormatError) as caught:
+            list(read_opml(io.BytesIO(broken)))
+        self.assertEqual(caught.exception.line, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import io
+import json
+import os
+import unittest
+
+from events import BULK_LOADED
+from skill_export import EXPORTERS, LiveTree, leaf_progress
+from skill_model import SkillModel
+from tests.fakes import FakeWidget, make_app
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class AddSkillTest(unittest.TestCase):
+    def setUp(self):
+        self.app = make_app()
+        self.app._deserialize_tree("", {"children": [
+            {"text": "Math", "completed": False, "open": False, "children": [
+                {"text": "Algebra", "completed": False, "open": False, "children": [
+                    {"text": "Equations", "completed": True, "open": True, "children": []},
+                    {"text": "Inequalities", "completed": False, "open": True, "children": []}
+                ]}
+            ]}
+        ]})
+        self.app.events.emit(BULK_LOADED)
+        self.app.item_dict = {path: self.app.node_ids.stable_id(item) for path, item in self.app._item_paths().items()}
+
+    def add(self, name, parent_path):
+        self.app._add_skill(name, parent_path, FakeWidget())
+        return self.app.node_ids.item(self.app.item_dict.get(parent_path, ""))
+
+    def assert_indexed(self, name, depth):
+        item = next(item for item in self.app.depth_index[depth] if self.app.tree.item(item, "text") == name)
+        self.assertTrue(self.app.tree.exists(item))
+        # Expanding and collapsing by level still reaches every indexed item
+        self.app.expand_to_level(len(self.app.depth_index) + 1)
+        return item
+
+    def test_add_after_filter_cleared(self):
+        self.app.filter.apply("Hide completed")
+        self.app.filter.clear()
+
+        parent = self.add("Graphs", "Math > Algebra")
+        item = self.assert_indexed("Graphs", 2)
+        self.assertEqual(self.app.filter.parent_of(item), parent)
+
+    def test_add_after_eviction(self):
+        math = self.app.node_ids.item(self.app.item_dict["Math"])
+        self.app._evict_subtree(math)
+
+        parent = self.add("Graphs", "Math > Algebra")
+        item = self.assert_indexed("Graphs", 2)
+        self.assertEqual(self.app.filter.parent_of(item), parent)
+
+    def test_add_under_same_named_sibling(self):
+        algebra = self.app.node_ids.item(self.app.item_dict["Math > Algebra"])
+        practice = [self.app.tree.insert(algebra, "end", text="Practice") for _ in range(2)]
+        for item in practice:
+            self.app.node_ids.assign(item, algebra, "Practice")
+        self.app.item_dict = {label: self.app.node_ids.stable_id(item) for label, item in self.app._item_labels()}
+
+        self.assertIn("Math > Algebra > Practice (2)", self.app.item_dict)
+        self.assertEqual(self.add("Drills", "Math > Algebra > Practice (2)"), practice[1])
+        self.assertEqual(self.app.tree.get_children(practice[0]), ())
+
+    def test_synced_child_of_synced_skill(self):
+        self.app.filter.apply("Hide completed")
+        self.app.filter.clear()
+
+        algebra = self.app.node_ids.stable_id(self.app.node_ids.item(self.app.item_dict["Math > Algebra"]))
+        self.app._apply_deltas([
+            {"op": "add", "id": "graphs", "parent": algebra, "text": "Graphs"},
+            {"op": "add", "id": "plotting", "parent": "graphs", "text": "Plotting"}
+        ])
+        self.assert_indexed("Graphs", 2)
+        self.assert_indexed("Plotting", 3)
+
+
+class Label(FakeWidget):
+    def configure(self, text):
+        self.text = text
+
+
+class Combobox(FakeWidget):
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class InstructionsTest(unittest.TestCase):
+    def test_instructions_follow_the_policy(self):
+        app = make_app()
+        app.instructions = Label()
+        app._show_instructions()
+        self.assertIn("Only skills without children can be directly marked", app.instructions.text)
+
+        app.policy_combo = Combobox("manual")
+        app._change_policy(None)
+        self.assertIn("Any skill can be directly marked", app.instructions.text)
+        self.assertIn("Parents are never completed automatically", app.instructions.text)
+
+        app.policy_combo = Combobox("threshold")
+        app._change_policy(None)
+        self.assertIn("80% of its children", app.instructions.text)
+
+
+class ExportTest(unittest.TestCase):
+    def test_live_tree_exports_like_a_copy(self):
+        app = make_app()
+        with open(os.path.join(REPO, "sample_tree.json"), encoding='utf-8') as f:
+            app._deserialize_tree("", json.load(f))
+        app.events.emit(BULK_LOADED)
+
+        # Evicted and filtered-out skills are exported too
+        first = app.tree.get_children()[0]
+        app.tree.item(first, open=False)
+        app._evict_subtree(app.tree.get_children(first)[0])
+        app.filter.apply("Hide completed")
+
+        live = LiveTree(app.filter.children_of, app.filter.parent_of, app._item_text, app._is_completed, app._is_open)
+        copy = SkillModel.from_json(app._serialize_tree(""))
+        for export_format in ("markdown", "html", "opml"):
+            outputs = []
+            for model in (live, copy):
+                f = io.StringIO()
+                EXPORTERS[export_format](model, f, leaf_progress(model))
+                outputs.append(f.getvalue())
+            self.assertEqual(outputs[0], outputs[1], export_format)
+
+
+if __name__ == '__main__':
+    unittest.main()
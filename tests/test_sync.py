@@ -0,0 +1,178 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from sync import SyncClient, SyncHub, _send
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class SyncTest(unittest.TestCase):
+    """Runs the hub as a separate `sync.py serve` process, like a peer on another machine."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.directory.name, "hub.sock")
+        self.hub = None
+        self.clients = []
+        self.start_hub()
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        self.stop_hub()
+        self.directory.cleanup()
+
+    def start_hub(self):
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        self.hub = subprocess.Popen(
+            [sys.executable, os.path.join(REPO, "sync.py"), "serve", self.address],
+            stdout=subprocess.DEVNULL
+        )
+        self.assertTrue(wait_for(self._hub_accepts), "hub did not start")
+
+    def stop_hub(self):
+        if self.hub is not None:
+            self.hub.kill()
+            self.hub.wait()
+            self.hub = None
+
+    def _hub_accepts(self):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.address)
+            return True
+        except OSError:
+            return False
+
+    def client(self):
+        client = SyncClient(self.address)
+        self.clients.append(client)
+        self.assertTrue(wait_for(lambda: client.epoch is not None), "client did not connect")
+        return client
+
+    def collect(self, client, count, timeout=5.0):
+        received = []
+        wait_for(lambda: received.extend(client.poll()) or len(received) >= count, timeout)
+        return received
+
+    def test_catch_up_after_disconnect(self):
+        sender, receiver = self.client(), self.client()
+        sender.send([{"op": "set", "id": "a", "completed": True}])
+        self.assertEqual([delta["id"] for delta in self.collect(receiver, 1)], ["a"])
+
+        # Drop the receiver's connection and send while it waits to reconnect
+        receiver.sock.shutdown(socket.SHUT_RDWR)
+        sender.send([{"op": "set", "id": "b", "completed": True}, {"op": "set", "id": "c", "completed": False}])
+
+        received = self.collect(receiver, 2)
+        self.assertEqual([delta["id"] for delta in received], ["b", "c"])
+        self.assertEqual([delta["seq"] for delta in received], [2, 3])
+        self.assertEqual(self.collect(receiver, 1, timeout=0.3), [])
+
+    def test_duplicates_are_logged_once(self):
+        receiver = self.client()
+        delta = {"op": "set", "id": "a", "completed": True, "origin": "peer", "local": 1}
+
+        # A raw peer sends the same delta twice, as it would after reconnecting
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.address)
+            _send(sock, {"type": "hello", "peer": "peer", "epoch": None, "since": 0})
+            _send(sock, {"type": "deltas", "deltas": [delta]})
+            _send(sock, {"type": "deltas", "deltas": [delta, dict(delta, id="b", local=2)]})
+            received = self.collect(receiver, 2)
+
+        self.assertEqual([delta["id"] for delta in received], ["a", "b"])
+        self.assertEqual(self.collect(receiver, 1, timeout=0.3), [])
+
+    def test_hub_restart_forces_reset(self):
+        sender, receiver = self.client(), self.client()
+        sender.send([{"op": "set", "id": str(i), "completed": True} for i in range(3)])
+        self.assertEqual(len(self.collect(receiver, 3)), 3)
+        first_epoch = receiver.epoch
+
+        # The new hub gets further than seq 3 before the receiver is back
+        self.stop_hub()
+        self.start_hub()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.address)
+            _send(sock, {"type": "hello", "peer": "peer", "epoch": None, "since": 0})
+            _send(sock, {"type": "deltas", "deltas": [
+                {"op": "set", "id": f"new{i}", "completed": True, "origin": "peer", "local": i}
+                for i in range(1, 6)
+            ]})
+            self.assertTrue(wait_for(lambda: receiver.epoch not in (None, first_epoch)))
+
+        received = self.collect(receiver, 1)
+        self.assertEqual(received[0], "reset")
+        self.assertEqual(receiver.last_seq, 5)
+
+
+class HubCloseTest(unittest.TestCase):
+    def setUp(self):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.address = f"127.0.0.1:{probe.getsockname()[1]}"
+
+    def connect(self):
+        host, port = self.address.rsplit(":", 1)
+        return socket.create_connection((host, int(port)))
+
+    def test_close_drops_clients_and_frees_address(self):
+        address = self.address
+        hub = SyncHub(address)
+        client = SyncClient(address)
+        try:
+            self.assertTrue(wait_for(lambda: client.sock is not None))
+            hub.close()
+            self.assertTrue(wait_for(lambda: client.sock is None), "client still connected")
+            hub = SyncHub(address)
+        finally:
+            client.close()
+            hub.close()
+
+    def test_close_drops_connections_not_yet_welcomed(self):
+        hub = SyncHub(self.address)
+        with self.connect() as sock:
+            self.assertTrue(wait_for(lambda: hub.sockets))
+            hub.close()
+            sock.settimeout(5.0)
+            self.assertEqual(sock.recv(1), b"")
+
+    def test_stalled_client_does_not_block_the_hub(self):
+        hub = SyncHub(self.address)
+        with self.connect() as sock:
+            # Says hello, then never reads what the hub sends
+            _send(sock, {"type": "hello", "peer": "stalled", "epoch": None, "since": 0})
+            self.assertTrue(wait_for(lambda: hub.connections))
+            sender = threading.Thread(target=hub.send, args=(
+                [{"op": "add", "id": str(i), "parent": "", "text": "x" * 1000} for i in range(10000)],
+            ))
+            sender.start()
+            self.assertTrue(wait_for(lambda: len(hub.log.entries) == 10000))
+
+            # The hub lock is free while the broadcast waits on the client
+            self.assertTrue(hub.lock.acquire(timeout=5.0))
+            hub.lock.release()
+            hub.close()
+            sender.join(5.0)
+            self.assertFalse(sender.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
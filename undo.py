@@ -0,0 +1,94 @@
+"""
+Undo and Redo
+A bounded log of completion changes. Each action is stored as the
+numbers of the skills it changed plus their previous states packed one
+bit per skill, so even a cascade over a large subtree stays small.
+"""
+from array import array
+from collections import deque
+
+
+def _pack_bits(bits):
+    """Pack a sequence of booleans into bytes, eight per byte."""
+    packed = bytearray((len(bits) + 7) // 8)
+    for i, bit in enumerate(bits):
+        if bit:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+class UndoLog:
+    def __init__(self, set_completed, depth=100):
+        # Callback that gives a skill a status without propagating it
+        self.set_completed = set_completed
+
+        # Each entry is (skill numbers, packed previous states)
+        self.undo_stack = deque(maxlen=depth)
+        self.redo_stack = []
+
+        # Skill id <-> small number, so ids of any type fit in an array
+        self.numbers = {}
+        self.nodes = []
+
+    @property
+    def depth(self):
+        return self.undo_stack.maxlen
+
+    @depth.setter
+    def depth(self, depth):
+        self.undo_stack = deque(self.undo_stack, maxlen=depth)
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def _number(self, node):
+        number = self.numbers.get(node)
+        if number is None:
+            number = self.numbers[node] = len(self.nodes)
+            self.nodes.append(node)
+        return number
+
+    def record(self, nodes, previous):
+        """Log an action that changed nodes, whose states before it were previous."""
+        if not nodes:
+            return
+        numbers = array('I', map(self._number, nodes))
+        self.undo_stack.append((numbers, _pack_bits(list(previous))))
+        self.redo_stack.clear()
+
+    def _apply(self, entry, invert):
+        """Give every skill in entry its logged state, or the opposite one."""
+        numbers, packed = entry
+        nodes = self.nodes
+        changed = []
+        for i, number in enumerate(numbers):
+            status = bool((packed[i >> 3] >> (i & 7)) & 1) != invert
+            self.set_completed(nodes[number], status)
+            changed.append(nodes[number])
+        return changed
+
+    def undo(self):
+        """Restore the states before the last action and return the skills it touched."""
+        if not self.undo_stack:
+            return []
+        entry = self.undo_stack.pop()
+        self.redo_stack.append(entry)
+        return self._apply(entry, False)
+
+    def redo(self):
+        """Apply the last undone action again and return the skills it touched."""
+        if not self.redo_stack:
+            return []
+        entry = self.redo_stack.pop()
+        self.undo_stack.append(entry)
+        return self._apply(entry, True)
+
+    def clear(self):
+        """Forget every action, e.g. when a different tree is loaded."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.numbers.clear()
+        self.nodes.clear()